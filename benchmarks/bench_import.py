@@ -0,0 +1,58 @@
+'''
+Measures cold-start import cost of package and of each pipeline's entry points, each in a fresh interpreter run with `-X importtime`,
+so that short-lived scheduled runs can see which backends they pay for.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --top 15 --repeat 3
+'''
+import argparse
+import subprocess
+import sys
+
+# Symbols first touched by each pipeline of `main.py`
+PIPELINES = {
+    'package': [],
+    'gnews': ['extract_news', 'process_text_stats', 'sql_insert_articles'],
+    'scidaily': ['extract_scidaily', 'process_text_stats', 'sql_insert_articles'],
+    'rss': ['extract_rss_feeds', 'process_text_stats', 'sql_insert_articles'],
+    'trade_econ': ['create_entry_from_rss', 'create_redis_records', 'key_val_insert'],
+    'alphavan': ['get_alphavan_data', 'extract_price_data', 'insert_to_collection', 'mongodb_connection'],
+    'weather': ['IQAirBuilder', 'OpenWeatherBuilder', 'reformat_iqair', 'BQClimate']
+}
+
+def import_profile(symbols: list[str]) -> tuple[int, list[tuple[int, str]]]:
+    '''Returns total import time in microseconds and per-module cumulative times, parsed from `-X importtime` output'''
+    _code = 'import multiextractor\n' + ''.join(f'multiextractor.{symbol}\n' for symbol in symbols)
+    _proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _code], capture_output=True, text=True)
+    if _proc.returncode != 0:
+        raise RuntimeError(_proc.stderr.strip().splitlines()[-1])
+    _top_level = []
+    for line in _proc.stderr.splitlines():
+        if not line.startswith('import time:') or ('cumulative' in line):
+            continue
+        _, _cumulative, _name = line[len('import time:'):].split('|')
+        # Nested imports are indented below their parent; only top-level ones add up to total time
+        if not _name.startswith('  '):
+            _top_level.append((int(_cumulative), _name.strip()))
+    return sum(us for us, _ in _top_level), sorted(_top_level, reverse=True)
+
+def main():
+    _argparser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _argparser.add_argument('--top', type=int, default=5, help='number of slowest top-level imports shown per pipeline')
+    _argparser.add_argument('--repeat', type=int, default=1, help='runs per pipeline; fastest is reported')
+    args = _argparser.parse_args()
+
+    print(f'{"pipeline":<12}{"import ms":>10}  slowest top-level imports')
+    for pipeline, symbols in PIPELINES.items():
+        try:
+            _runs = [import_profile(symbols) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f'{pipeline:<12}{"n/a":>10}  {e}')
+            continue
+        _total, _modules = min(_runs, key=lambda run: run[0])
+        _slowest = ', '.join(f'{name} {us / 1000:.0f}' for us, name in _modules[:args.top])
+        print(f'{pipeline:<12}{_total / 1000:>10.1f}  {_slowest}')
+
+if __name__ == '__main__':
+    main()
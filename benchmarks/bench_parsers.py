@@ -0,0 +1,65 @@
+'''
+Benchmarks BeautifulSoup parser backends on saved or fetched pages, reporting per-page parse time and peak memory for full and partial (SoupStrainer) parsing.
+
+Usage:
+    python benchmarks/bench_parsers.py --url https://www.sciencedaily.com/news/computers_math/artificial_intelligence/ --selector 'div[id*="heroes"]'
+    python benchmarks/bench_parsers.py --file page.html --selector 'div[id="story_text"]' --repeat 20
+
+Peak memory is measured with `tracemalloc`, which tracks the Python objects making up the parsed tree but not parser-internal C allocations.
+'''
+import argparse
+import time
+import tracemalloc
+from multiextractor.apis.fetch import fetch_sync
+from multiextractor.transforms.soup_funcs import build_soup, build_strainer, locate_elements, PARSER_BACKENDS
+
+def bench_parse(markup: bytes, parser: str, selector: str, partial: bool, repeat: int) -> dict:
+    _strainer = build_strainer(selector) if partial else None
+    _timings = []
+    for _ in range(repeat):
+        _start = time.perf_counter()
+        soup = build_soup(markup, parser, parse_only=_strainer)
+        _found = locate_elements(soup, selector, 'select')
+        _timings.append(time.perf_counter() - _start)
+
+    tracemalloc.start()
+    soup = build_soup(markup, parser, parse_only=_strainer)
+    _, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'parser': parser,
+        'partial': partial and (_strainer is not None) and (parser != 'html5lib'),
+        'mean_ms': 1000 * sum(_timings) / len(_timings),
+        'min_ms': 1000 * min(_timings),
+        'peak_kib': _peak / 1024,
+        'matches': len(_found)
+    }
+
+def main():
+    _argparser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _source = _argparser.add_mutually_exclusive_group(required=True)
+    _source.add_argument('--url', help='page to fetch once and parse repeatedly')
+    _source.add_argument('--file', help='saved HTML page')
+    _argparser.add_argument('--selector', required=True, help='element search string of target subtree')
+    _argparser.add_argument('--repeat', type=int, default=10)
+    args = _argparser.parse_args()
+
+    if args.url is not None:
+        markup = fetch_sync(args.url).body
+    else:
+        with open(args.file, 'rb') as f:
+            markup = f.read()
+
+    print(f'page size: {len(markup) / 1024:.1f} KiB, selector: {args.selector}')
+    print(f'{"parser":<12}{"partial":<9}{"mean ms":>10}{"min ms":>10}{"peak KiB":>12}{"matches":>9}')
+    for parser in PARSER_BACKENDS:
+        for partial in [False, True]:
+            try:
+                _res = bench_parse(markup, parser, args.selector, partial, args.repeat)
+            except Exception as e:
+                print(f'{parser:<12}{str(partial):<9} unavailable: {e}')
+                continue
+            print(f'{_res["parser"]:<12}{str(_res["partial"]):<9}{_res["mean_ms"]:>10.2f}{_res["min_ms"]:>10.2f}{_res["peak_kib"]:>12.1f}{_res["matches"]:>9}')
+
+if __name__ == '__main__':
+    main()
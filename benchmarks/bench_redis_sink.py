@@ -0,0 +1,57 @@
+'''
+Benchmarks Redis sink (`key_val_insert`) throughput for string and hash storage across serializers, against a local Redis stand-in.
+
+Usage:
+    python benchmarks/bench_redis_sink.py --records 50000
+    python benchmarks/bench_redis_sink.py --host localhost --port 6379 --chunk-size 2000 --ttl 600
+
+Keys are written under a `bench:` prefix and expire after `--ttl` seconds.
+'''
+import argparse
+from datetime import datetime, timezone
+import multiextractor
+from multiextractor.query import REDIS_SERIALIZERS, REDIS_STORAGE_MODES
+
+class LocalParams:
+    '''Connection parameters of local Redis, in the shape of `DBConstLoader`'''
+    def __init__(self, host: str, port: int):
+        self.DB_HOST = host
+        self.DB_PORT = port
+        self.DB_KEY = None
+
+def synthetic_records(n: int) -> dict[str, dict]:
+    _now = datetime.now(timezone.utc).isoformat()
+    return {
+        f'bench:teblr_{i:08d}': {
+            'title': f'Bank lending rate update {i}',
+            'description': 'Central bank keeps benchmark lending rate unchanged. ' * 4,
+            'url': f'https://tradingeconomics.com/news/{i}',
+            'publishedAt': _now,
+            'numSents': i % 7
+        }
+        for i in range(n)
+    }
+
+def main():
+    _argparser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _argparser.add_argument('--records', type=int, default=20000)
+    _argparser.add_argument('--host', default='localhost')
+    _argparser.add_argument('--port', type=int, default=6379)
+    _argparser.add_argument('--chunk-size', type=int, default=1000)
+    _argparser.add_argument('--ttl', type=int, default=300)
+    args = _argparser.parse_args()
+
+    records = synthetic_records(args.records)
+    conn_params = LocalParams(args.host, args.port)
+    print(f'{"storage":<8}{"serializer":<12}{"records/s":>12}{"failed":>8}{"MiB":>8}')
+    for storage in REDIS_STORAGE_MODES:
+        for serializer in REDIS_SERIALIZERS:
+            try:
+                _report = multiextractor.key_val_insert(records, conn_params, storage=storage, serializer=serializer, ttl=args.ttl, chunk_size=args.chunk_size)
+            except ImportError as e:
+                print(f'{storage:<8}{serializer:<12} unavailable: {e}')
+                continue
+            print(f'{storage:<8}{serializer:<12}{_report["written"] / _report["elapsed"]:>12.0f}{_report["failed"]:>8}{_report["bytes"] / 2 ** 20:>8.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+Benchmarks single-pass text profiling (`process_text_stats`) against the previous `process_sentence_count` + `process_token_count` chain,
+and checks both produce identical count columns.
+
+Usage:
+    python benchmarks/bench_text_stats.py --rows 2000
+    python benchmarks/bench_text_stats.py --csv articles.csv --repeat 3
+'''
+import argparse
+import time
+import random
+import pandas as pd
+import multiextractor
+
+TEXT_COLS = ['title', 'description', 'content']
+
+_WORDS = ['market', 'rates', "don't", 'central', 'bank', 'inflation', 'U.S.', 'growth', 'cannot', 'yields', 'e-mail', 'AI', 'models', '3.5%', 'research']
+
+def synthetic_articles(rows: int, seed: int = 0) -> pd.DataFrame:
+    _rng = random.Random(seed)
+    def _text(num_sents: int) -> str:
+        return ' '.join(' '.join(_rng.choice(_WORDS) for _ in range(_rng.randint(5, 20))).capitalize() + '.' for _ in range(num_sents))
+    return pd.DataFrame({
+        'title': [_text(1) for _ in range(rows)],
+        'description': [_text(2) for _ in range(rows)],
+        'content': [_text(_rng.randint(5, 30)) for _ in range(rows)]
+    })
+
+def two_pass(df: pd.DataFrame, nlp) -> pd.DataFrame:
+    _tmp = multiextractor.process_sentence_count(df, nlp, *TEXT_COLS)
+    return multiextractor.process_token_count(_tmp, nlp, *TEXT_COLS)
+
+def single_pass(df: pd.DataFrame, nlp) -> pd.DataFrame:
+    return multiextractor.process_text_stats(df, nlp, *TEXT_COLS)
+
+def timed(fn, df: pd.DataFrame, nlp, repeat: int):
+    _timings = []
+    for _ in range(repeat):
+        _start = time.perf_counter()
+        _res = fn(df, nlp)
+        _timings.append(time.perf_counter() - _start)
+    return _res, min(_timings)
+
+def main():
+    _argparser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _argparser.add_argument('--csv', help='CSV of articles with title, description and content columns')
+    _argparser.add_argument('--rows', type=int, default=1000, help='number of synthetic articles if no CSV is given')
+    _argparser.add_argument('--repeat', type=int, default=1)
+    args = _argparser.parse_args()
+
+    df = pd.read_csv(args.csv)[TEXT_COLS] if args.csv is not None else synthetic_articles(args.rows)
+    nlp = multiextractor.SPACY_NLP
+
+    _res_two, _t_two = timed(two_pass, df, nlp, args.repeat)
+    _res_one, _t_one = timed(single_pass, df, nlp, args.repeat)
+    _count_cols = [c for c in _res_two.columns if c.endswith(('NumSents', 'NumTokens'))]
+    pd.testing.assert_frame_equal(_res_two[_count_cols], _res_one[_count_cols], check_dtype=False)
+
+    print(f'rows: {len(df)}')
+    print(f'two-pass chain:   {_t_two:.3f} s')
+    print(f'single pass:      {_t_one:.3f} s  ({_t_two / _t_one:.1f}x)')
+    print(f'count columns identical: {_count_cols}')
+
+if __name__ == '__main__':
+    main()
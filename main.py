@@ -1,75 +1,39 @@
+import asyncio
 import pandas as pd
 import polars as pl
 import multiextractor
-from multiextractor import SciDailyConstants as sci
 from multiextractor import DBConstLoader
 
-def gnews_extract() -> pd.DataFrame:
-    _, articles = multiextractor.extract_news()
+def gnews_extract(seen_index: multiextractor.SeenIndex | None = None) -> pd.DataFrame:
+    _, articles = multiextractor.extract_news(seen_index=seen_index)
     df_articles = pd.DataFrame.from_dict(articles)
     return df_articles
 
-def gnews_transform(df_articles: pd.DataFrame) -> pd.DataFrame:
+def gnews_transform(df_articles: pd.DataFrame, cache: multiextractor.TextStatsCache | None = None) -> pd.DataFrame:
     df_articles = multiextractor.split_source(df_articles)
     df_articles = multiextractor.process_datetime(df_articles)
-    df_articles = multiextractor.process_sentence_count(df_articles, multiextractor.SPACY_NLP, 'title', 'description', 'content')
-    df_articles = multiextractor.process_token_count(df_articles, multiextractor.SPACY_NLP, 'title', 'description', 'content')
+    df_articles = multiextractor.process_text_stats(df_articles, multiextractor.get_nlp('sentences'), 'title', 'description', 'content', cache=cache)
     return df_articles
 
-def gnews_load(df_articles: pd.DataFrame) -> None:
+def gnews_load(df_articles: pd.DataFrame, seen_index: multiextractor.SeenIndex | None = None) -> None:
     conn_params = DBConstLoader('gnews')
     multiextractor.sql_create_table(df_articles, unique_col='title', conn_params=conn_params)
-    multiextractor.sql_insert_articles(df_articles, constraint_col='title', conn_params=conn_params)
+    report = multiextractor.sql_insert_articles(df_articles, constraint_col='title', conn_params=conn_params)
+    if seen_index is not None: seen_index.add(df_articles.loc[report['loaded_index'], 'url'].tolist())
 
-def scidaily_extract() -> tuple[list]:
-    soup_heroes = multiextractor.extract_content(sci.SCI_URL_FULL, 'div[id*="heroes"]', 'select')[0]
-    
-    soup_latests = multiextractor.locate_elements(soup_heroes, 'div[class*="latest-head"]', 'select')
-    article_titles = multiextractor.process_text(soup_heroes, 'title', method='select', element_search='div[class*="latest-head"]')
-    article_summary = multiextractor.process_text(soup_heroes, 'story', method='select', element_search='div[class*="latest-summary"]', translator=multiextractor.TRANSLATOR)
-
-    story_list, url_list, pub_date_full_list = [], [], []
-    for soup_latest in soup_latests:
-        soup_latest_a = multiextractor.locate_elements(soup_latest, 'a', 'find')
-        href_latest = soup_latest_a['href']
-        pub_date_full = multiextractor.extract_date(href_latest)
-
-        STORY_URL = sci.SCI_DOMAIN_NAME + href_latest
-        soup_story = multiextractor.extract_content(STORY_URL, 'div[id="story_text"]', 'select')[0]
-        article_story = multiextractor.process_text(soup_story, 'story', translator=multiextractor.TRANSLATOR)
-        
-        story_list.append(article_story)
-        url_list.append(STORY_URL)
-        pub_date_full_list.append(pub_date_full)
-        return article_titles, article_summary, story_list, url_list, pub_date_full_list
-
-def scidaily_transform(
-        article_titles: list[str], 
-        article_summary: list[str], 
-        story_list: list[str], 
-        url_list: list[str], 
-        pub_date_full_list: list[str]
-    ) -> pd.DataFrame:
-    
-    df_articles_2 = pd.DataFrame({
-        'title': article_titles,
-        'description': article_summary,
-        'content': story_list,
-        'url': url_list,
-        'image': '',
-        'publishedAt': pub_date_full_list,
-        'name': sci.SCI_SITE_NAME,
-        'domainName': sci.SCI_DOMAIN_NAME
-    })
+def scidaily_extract(max_workers: int = 8, article_cache: multiextractor.ArticleCache | None = None, seen_index: multiextractor.SeenIndex | None = None) -> pd.DataFrame:
+    df_articles_2 = asyncio.run(multiextractor.extract_scidaily(max_workers, article_cache=article_cache, executor=multiextractor.get_shared_executor(), seen_index=seen_index))
+    return df_articles_2
 
+def scidaily_transform(df_articles_2: pd.DataFrame, cache: multiextractor.TextStatsCache | None = None) -> pd.DataFrame:
     df_articles_2 = multiextractor.process_datetime(df_articles_2)
-    df_articles_2 = multiextractor.process_sentence_count(df_articles_2, multiextractor.SPACY_NLP, 'title', 'description', 'content')
-    df_articles_2 = multiextractor.process_token_count(df_articles_2, multiextractor.SPACY_NLP, 'title', 'description', 'content')
+    df_articles_2 = multiextractor.process_text_stats(df_articles_2, multiextractor.get_nlp('sentences'), 'title', 'description', 'content', cache=cache)
     return df_articles_2
 
-def scidaily_load(df_articles_2: pd.DataFrame) -> None:
+def scidaily_load(df_articles_2: pd.DataFrame, seen_index: multiextractor.SeenIndex | None = None) -> None:
     conn_params = DBConstLoader('scidaily')
-    multiextractor.sql_insert_articles(df_articles_2, constraint_col='title', conn_params=conn_params)
+    report = multiextractor.sql_insert_articles(df_articles_2, constraint_col='title', conn_params=conn_params)
+    if seen_index is not None: seen_index.add(df_articles_2.loc[report['loaded_index'], 'url'].tolist())
 
 def alphavan_extract(ticker: str) -> tuple[dict | list[dict]]:
     ticker_prices = multiextractor.get_alphavan_data('daily_price', tickers=ticker)
@@ -115,64 +79,73 @@ def alphavan_load(
     client = multiextractor.mongodb_connection(conn_params)
     db_name = multiextractor.mongodb_get_db(client, conn_params)
 
-    query_result = multiextractor.check_doc_presence(db_name, 'alphav_sentiment_reference', 'sentiment', {'$in': ['Bearish', 'Somewhat-Bearish', 'Neutral', 'Somewhat_Bullish', 'Bullish']})
-    if len(list(query_result)) == 0:
-        multiextractor.insert_to_collection(db_name, 'alphav_sentiment_reference', sent_data_list, set_index=[('sentiment', 1)], unique=True, ordered=False)
-        
-    for df_ticker_article_base, df_ticker_sent, df_ticker_topics in zip(article_base_list, sentiments_list, topics_list):
-        query_result = multiextractor.check_doc_presence(db_name, 'alphav_news_main', 'title', {'$eq': df_ticker_article_base['title'].values[0]})
-        if len(list(query_result)) == 0:
-            multiextractor.insert_to_collection(db_name, 'alphav_news_main', df_ticker_article_base.to_dict(orient='records'), set_index=[('title', 1), ('time_published', 1)], unique=True, ordered=False)  
-            multiextractor.insert_to_collection(db_name, 'alphav_news_topic', df_ticker_topics.to_dict(orient='records'), set_index=[('title', 1), ('time_published', 1), ('topic', 1)], unique=True, ordered=False)
-            multiextractor.insert_to_collection(db_name, 'alphav_news_comp_sent', df_ticker_sent.to_dict(orient='records'), set_index=[('title', 1), ('time_published', 1), ('ticker', 1)], unique=True, ordered=False)
-
-    df_daily_treasury = multiextractor.subset_data(df_daily_treasury, db_name, 'alphav_treasury', 'date')
-    if df_daily_treasury is not None:
-        multiextractor.insert_to_collection(db_name, 'alphav_treasury', df_daily_treasury.to_dict(orient='records'), set_index=[('date', 1)], unique=True, ordered=False)
-    
-    df_annual_inflation = multiextractor.subset_data(df_annual_inflation, db_name, 'alphav_inflation', 'date')
-    if df_annual_inflation is not None:
-        multiextractor.insert_to_collection(db_name, 'alphav_inflation', df_annual_inflation.to_dict(orient='records'), set_index=[('date', 1)], unique=True, ordered=False)
-    
-    df_stock_prices = multiextractor.subset_data(df_stock_prices, db_name, 'alphav_daily_price', ['date', 'ticker'])
-    if df_stock_prices is not None:
-        multiextractor.insert_to_collection(db_name, 'alphav_daily_price', df_stock_prices.to_dict(orient='records'), set_index=[('date', 1), ('last_refreshed', 1), ('ticker', 1)], unique=True, ordered=False)
-
-async def cnbc_rss_extract(pool_num: int = 8):
+    write_results = {
+        'alphav_sentiment_reference': multiextractor.bulk_upsert(db_name, 'alphav_sentiment_reference', sent_data_list, ['sentiment'], set_index=[('sentiment', 1)], unique=True)
+    }
+    write_results.update(multiextractor.bulk_load_news(db_name, article_base_list, sentiments_list, topics_list))
+
+    watermarks = multiextractor.WatermarkStore(db_name)
+    for collection_name, df, column, set_index in [
+        ('alphav_treasury', df_daily_treasury, 'date', [('date', 1)]),
+        ('alphav_inflation', df_annual_inflation, 'date', [('date', 1)]),
+        ('alphav_daily_price', df_stock_prices, ['date', 'ticker'], [('date', 1), ('last_refreshed', 1), ('ticker', 1)])
+    ]:
+        df_new = multiextractor.subset_data(df, db_name, collection_name, column, watermarks=watermarks)
+        if df_new is not None:
+            write_results[collection_name] = multiextractor.load_with_watermark(db_name, collection_name, df_new, column, set_index, watermarks=watermarks)
+    print(write_results)
+
+async def cnbc_rss_extract(pool_num: int = 8, feed_state: multiextractor.FeedStateStore | None = None, article_cache: multiextractor.ArticleCache | None = None, seen_index: multiextractor.SeenIndex | None = None):
     url = 'https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=19854910'
-    df = await multiextractor.create_entry_from_rss(url, pool_num, body_attrs={'class': 'ArticleBody-articleBody'}, list_attrs={'class': 'group'})
+    df = await multiextractor.create_entry_from_rss(url, pool_num, body_attrs={'class': 'ArticleBody-articleBody'}, list_attrs={'class': 'group'}, feed_state=feed_state, article_cache=article_cache, executor=multiextractor.get_shared_executor(), seen_index=seen_index)
     return df
 
-def cnbc_rss_transform(df: pd.DataFrame):
+def cnbc_rss_transform(df: pd.DataFrame, cache: multiextractor.TextStatsCache | None = None):
     tmp = df.copy()
     tmp = multiextractor.process_datetime(tmp)
-    tmp = multiextractor.process_sentence_count(tmp, multiextractor.SPACY_NLP, 'title', 'description', 'content')
-    tmp = multiextractor.process_token_count(tmp, multiextractor.SPACY_NLP, 'title', 'description', 'content')
+    tmp = multiextractor.process_text_stats(tmp, multiextractor.get_nlp('sentences'), 'title', 'description', 'content', cache=cache)
     return tmp
 
-def cnbc_rss_load(df: pd.DataFrame):
+def cnbc_rss_load(df: pd.DataFrame, seen_index: multiextractor.SeenIndex | None = None):
     conn_params = multiextractor.DBConstLoader('cnbc')
-    multiextractor.sql_create_table(df, conn_params, table_name='cnbc_articles', unique_col='title')
-    multiextractor.sql_insert_articles(df, conn_params, table_name='cnbc_articles', constraint_col='title')
+    multiextractor.sql_create_table(df, table_name='cnbc_articles', unique_col='title', conn_params=conn_params)
+    report = multiextractor.sql_insert_articles(df, constraint_col='title', conn_params=conn_params, table_name='cnbc_articles')
+    if seen_index is not None: seen_index.add(df.loc[report['loaded_index'], 'url'].tolist())
+    
+async def cnbc_rss_stream(batch_size: int = 5, pool_num: int = 8, feed_state: multiextractor.FeedStateStore | None = None, article_cache: multiextractor.ArticleCache | None = None, seen_index: multiextractor.SeenIndex | None = None, text_stats_cache: multiextractor.TextStatsCache | None = None):
+    url = 'https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=19854910'
+    async for df, dropped in multiextractor.stream_entries_from_rss(url, pool_num, body_attrs={'class': 'ArticleBody-articleBody'}, list_attrs={'class': 'group'}, feed_state=feed_state, article_cache=article_cache, executor=multiextractor.get_shared_executor(), seen_index=seen_index, batch_size=batch_size):
+        if len(dropped) > 0: print(f'Entries dropped: {dropped}')
+        if df.shape[0] == 0: continue
+        tmp = await asyncio.to_thread(cnbc_rss_transform, df, text_stats_cache)
+        await asyncio.to_thread(cnbc_rss_load, tmp, seen_index)
     
-async def trade_econ_extract(pool_num: int = 8):
+async def trade_econ_extract(pool_num: int = 8, feed_state: multiextractor.FeedStateStore | None = None, seen_index: multiextractor.SeenIndex | None = None):
     url = 'https://tradingeconomics.com/rss/news.aspx?i=bank+lending+rate'
-    df = await multiextractor.create_entry_from_rss(url, pool_num)
+    df = await multiextractor.create_entry_from_rss(url, pool_num, feed_state=feed_state, seen_index=seen_index)
     return df
 
-def trade_econ_transform(df: pd.DataFrame):
+def trade_econ_transform(df: pd.DataFrame, cache: multiextractor.TextStatsCache | None = None):
     tmp = df.copy()
     tmp = multiextractor.process_datetime(tmp)
-    tmp = multiextractor.process_sentence_count(tmp, multiextractor.SPACY_NLP, 'title', 'description', 'content')
-    tmp = multiextractor.process_token_count(tmp, multiextractor.SPACY_NLP, 'title', 'description', 'content')
+    tmp = multiextractor.process_text_stats(tmp, multiextractor.get_nlp('sentences'), 'title', 'description', 'content', cache=cache)
     return tmp
 
-def trade_econ_load(df: pd.DataFrame, redis_hash_idx_name: str = 'teblr'):
+def trade_econ_load(df: pd.DataFrame, redis_hash_idx_name: str = 'teblr', seen_index: multiextractor.SeenIndex | None = None):
     conn_params = multiextractor.DBConstLoader('trade_econ')
     tmp = multiextractor.dt_to_isoformat(df)
-    records = multiextractor.create_redis_records(tmp)
-    multiextractor.key_val_insert(records, conn_params)
+    records = multiextractor.create_redis_records(tmp, redis_hash_idx_name)
+    report = multiextractor.key_val_insert(records, conn_params)
+    print(report)
+    if seen_index is not None:
+        _failed = set(report['failed_keys'])
+        seen_index.add([rec['url'] for rec_id, rec in records.items() if rec_id not in _failed])
     
+async def rss_extract(feed_specs: list[dict] | None = None, max_concurrency: int = 16, feed_state: multiextractor.FeedStateStore | None = None, article_cache: multiextractor.ArticleCache | None = None, seen_index: multiextractor.SeenIndex | None = None):
+    feed_specs = multiextractor.RSS_FEEDS if feed_specs is None else feed_specs
+    df = await multiextractor.extract_rss_feeds(feed_specs, max_concurrency, feed_state=feed_state, article_cache=article_cache, executor=multiextractor.get_shared_executor(), seen_index=seen_index)
+    return df
+
 def iqair_extract(country: str, state: str, city: str):
     iqa_countries = multiextractor.IQAirBuilder('countries')
     iqa_states = multiextractor.IQAirBuilder('states')
@@ -225,21 +198,22 @@ if __name__ == '__main__':
     df_articles = gnews_transform(df_articles)
     gnews_load(df_articles)
     
-    article_titles, article_summary, story_list, url_list, pub_date_full_list = scidaily_extract()
-    df_articles_2 = scidaily_transform(article_titles, article_summary, story_list, url_list, pub_date_full_list)
+    df_articles_2 = scidaily_extract()
+    df_articles_2 = scidaily_transform(df_articles_2)
     scidaily_load(df_articles_2)
     
     ticker_prices, news, yield_data, inflation_data = alphavan_extract('AAPL')
     sent_data_list, article_base_list, sentiments_list, topics_list, df_daily_treasury, df_annual_inflation, df_stock_prices = alphavan_transform(ticker_prices, news, yield_data, inflation_data)
     alphavan_load(sent_data_list, article_base_list, sentiments_list, topics_list, df_daily_treasury, df_annual_inflation, df_stock_prices)
     
-    cnbc_rss = cnbc_rss_extract()
-    cnbc_rss = cnbc_rss_transform(cnbc_rss)
-    cnbc_rss_transform(cnbc_rss)
-    
-    trade_econ_blr = trade_econ_extract()
-    trade_econ_blr = trade_econ_transform(trade_econ_blr)
-    trade_econ_load(trade_econ_blr)
+    rss_articles = asyncio.run(rss_extract())
+    rss_by_source = {source: df.drop(columns='source').reset_index(drop=True) for source, df in rss_articles.groupby('source')}
+    if 'cnbc' in rss_by_source:
+        cnbc_rss = cnbc_rss_transform(rss_by_source['cnbc'])
+        cnbc_rss_load(cnbc_rss)
+    if 'trade_econ' in rss_by_source:
+        trade_econ_blr = trade_econ_transform(rss_by_source['trade_econ'])
+        trade_econ_load(trade_econ_blr)
 
     country, state, city = 'Canada', 'British Columbia', 'Vancouver BC'
     iqa_countries, iqa_states, iqa_cities, iqa_data = iqair_extract(country, state, city)
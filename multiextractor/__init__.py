@@ -1,62 +1,175 @@
+import importlib
+from . import constants
 from .constants import (
     CATEGORY,
     LANGUAGE,
     COUNTRY,
     TEXT,
-    SPACY_NLP,
+    NLP_PROFILES,
+    get_nlp,
     TRANSLATOR,
     OPTIONS,
     METRICS,
     MAIN_POLLUTANT,
     ICON_CODE,
+    CACHE_DIR,
+    RSS_FEEDS,
     SciDailyConstants,
     DBConstLoader
 )
-from .apis import (
-    neondb_connection, 
-    mongodb_connection, 
-    extract_news, 
-    get_alphavan_data, 
-    mongodb_get_db, 
-    extract_content, 
-    extract_rss_body, 
-    create_entry_from_rss, 
-    populate_data_struct, 
-    parallel_rss_extract,
-    pg_connection,
-    IQAirBuilder,
-    OpenWeatherBuilder
-)
-from .query import (
-    sql_create_table, 
-    sql_insert_articles,
-    key_val_insert,
-    dt_to_isoformat,
-    create_redis_records,
-    BQClimate
-)
-from .transforms import (
-    extract_tokens,
-    extract_sentences,
-    rename_columns, 
-    split_source, 
-    process_datetime, 
-    process_sentence_count, 
-    process_token_count,
-    extract_price_data, 
-    extract_perc_data, 
-    extract_main_article,
-    generate_sentiment_data_dict, 
-    extract_ticker_sentiment_topic, 
-    insert_to_collection, 
-    check_doc_presence, 
-    extract_top_n, 
-    subset_data,
-    locate_elements,
-    process_text,
-    extract_date,
-    process_date,
-    reformat_iqair,
-    reformat_forecasted_ow,
-    reformat_current_ow
-)
\ No newline at end of file
+
+# Public names of submodules, imported only when first accessed so that each pipeline pays only for backends it uses
+_LAZY_SUBMODULES = {
+    '.apis.db': [
+        'neondb_connection',
+        'mongodb_connection',
+        'mongodb_get_db',
+        'pg_connection',
+        'PgPool',
+        'get_pg_pool',
+        'pg_pooled_connection',
+        'close_pg_pools'
+    ],
+    '.apis.fetch': [
+        'FetchEngine',
+        'FetchResponse',
+        'fetch_sync'
+    ],
+    '.apis.news': [
+        'extract_news',
+        'extract_content',
+        'extract_content_async',
+        'extract_rss_body',
+        'extract_rss_body_async',
+        'create_entry_from_rss',
+        'stream_entries_from_rss',
+        'extract_rss_feeds',
+        'extract_scidaily',
+        'populate_data_struct',
+        'parallel_rss_extract'
+    ],
+    '.apis.market': [
+        'get_alphavan_data'
+    ],
+    '.apis.weather': [
+        'IQAirBuilder',
+        'OpenWeatherBuilder'
+    ],
+    '.cache': [
+        'FeedStateStore',
+        'ArticleCache',
+        'DiskCache',
+        'TextStatsCache',
+        'SeenIndex',
+        'BloomFilter',
+        'normalize_url'
+    ],
+    '.schema': [
+        'SchemaRegistry',
+        'get_schema_registry',
+        'IndexRegistry',
+        'get_index_registry'
+    ],
+    '.workers': [
+        'SharedExecutor',
+        'get_shared_executor',
+        'shutdown_shared_executor',
+        'executor_stats'
+    ],
+    '.query': [
+        'sql_create_table',
+        'sql_insert_articles',
+        'key_val_insert',
+        'dt_to_isoformat',
+        'create_redis_records',
+        'BQClimate'
+    ],
+    '.transforms.text': [
+        'extract_tokens',
+        'extract_sentences',
+        'count_sentences',
+        'count_tokens',
+        'profile_texts',
+        'profile_texts_parallel',
+        'nlp_fingerprint'
+    ],
+    '.transforms.general': [
+        'rename_columns',
+        'split_source',
+        'process_datetime',
+        'process_sentence_count',
+        'process_token_count',
+        'process_text_stats'
+    ],
+    '.transforms.alphavan': [
+        'extract_price_data',
+        'extract_perc_data',
+        'extract_main_article',
+        'generate_sentiment_data_dict',
+        'extract_ticker_sentiment_topic',
+        'insert_to_collection',
+        'bulk_upsert',
+        'bulk_load_news',
+        'check_doc_presence',
+        'extract_top_n',
+        'subset_data',
+        'WatermarkStore',
+        'load_with_watermark'
+    ],
+    '.transforms.soup_funcs': [
+        'build_soup',
+        'build_strainer',
+        'build_attrs_strainer',
+        'locate_elements',
+        'process_text',
+        'extract_date',
+        'process_date',
+        'parse_content',
+        'parse_rss_body',
+        'parse_scidaily_story'
+    ],
+    '.transforms.feeds': [
+        'parse_feed',
+        'iterparse_feed_entries',
+        'FeedPullParser'
+    ],
+    '.transforms.climate': [
+        'reformat_iqair',
+        'reformat_forecasted_ow',
+        'reformat_current_ow'
+    ]
+}
+_LAZY_ATTRS = {name: module for module, names in _LAZY_SUBMODULES.items() for name in names}
+
+__all__ = [
+    'constants',
+    'CATEGORY',
+    'LANGUAGE',
+    'COUNTRY',
+    'TEXT',
+    'NLP_PROFILES',
+    'get_nlp',
+    'TRANSLATOR',
+    'OPTIONS',
+    'METRICS',
+    'MAIN_POLLUTANT',
+    'ICON_CODE',
+    'CACHE_DIR',
+    'RSS_FEEDS',
+    'SciDailyConstants',
+    'DBConstLoader',
+    'SPACY_NLP'
+] + list(_LAZY_ATTRS)
+
+def __getattr__(name: str):
+    # `SPACY_NLP` resolved lazily so that importing package does not load NLP model
+    if name == 'SPACY_NLP':
+        return constants.get_nlp()
+    if name in _LAZY_ATTRS:
+        _value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = _value
+        return _value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,4 +1,38 @@
-from .db import neondb_connection, mongodb_connection, mongodb_get_db, pg_connection
-from .news import extract_news, extract_content, extract_rss_body, create_entry_from_rss, populate_data_struct, parallel_rss_extract
-from .market import get_alphavan_data
-from .weather import IQAirBuilder, OpenWeatherBuilder
\ No newline at end of file
+import importlib
+
+# Public names of submodules, imported only when first accessed
+_LAZY_SUBMODULES = {
+    '.db': ['neondb_connection', 'mongodb_connection', 'mongodb_get_db', 'pg_connection', 'PgPool', 'get_pg_pool', 'pg_pooled_connection', 'close_pg_pools'],
+    '.fetch': ['FetchEngine', 'FetchResponse', 'fetch_sync'],
+    '.news': [
+        'extract_news', 
+        'extract_content', 
+        'extract_content_async', 
+        'parse_content', 
+        'extract_rss_body', 
+        'extract_rss_body_async', 
+        'parse_rss_body', 
+        'create_entry_from_rss', 
+        'stream_entries_from_rss', 
+        'extract_rss_feeds', 
+        'extract_scidaily', 
+        'parse_scidaily_story', 
+        'populate_data_struct', 
+        'parallel_rss_extract'
+    ],
+    '.market': ['get_alphavan_data'],
+    '.weather': ['IQAirBuilder', 'OpenWeatherBuilder']
+}
+_LAZY_ATTRS = {name: module for module, names in _LAZY_SUBMODULES.items() for name in names}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        _value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = _value
+        return _value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,42 +1,31 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-import psycopg2
-import pymongo
-import redis
+from contextlib import contextmanager
 import os
+import time
+import atexit
+import threading
 from multiextractor.constants import DBConstLoader
 
+if TYPE_CHECKING:
+    import psycopg2
+    import pymongo
+    import redis
+
 load_dotenv()
 
-NEON_DB_KEY = os.getenv('NEON_CONN_KEY')
-NEON_DB_USER = os.getenv('NEON_USER')
-NEON_COMPUTE_NAME = os.getenv('NEON_COMPUTE')
-NEON_LOCATION = os.getenv('NEON_LOCATION')
-NEON_DB_NAME = os.getenv('NEON_DB')
-NEON_PORT = os.getenv('NEON_PORT')
-
-MONGO_DB_USER = os.getenv('ATLAS_USER')
-MONGO_DB_KEY = os.getenv('ATLAS_KEY')
-MONGO_DB_NAME = os.getenv('ATLAS_DB')
-
-COCKROACH_USER = os.getenv('COCKROACH_USER')
-COCKROACH_PW = os.getenv('COCKROACH_PW')
-COCKROACH_HOST = os.getenv('COCKROACH_HOST')
-COCKROACH_PORT = os.getenv('COCKROACH_PORT')
-COCKROACH_DB = os.getenv('COCKROACH_DB')
-
-REDIS_USER = os.getenv('REDIS_USER')
-REDIS_KEY = os.getenv('REDIS_KEY')
-REDIS_HOST = os.getenv('REDIS_HOST')
-REDIS_PORT = os.getenv('REDIS_PORT')
-REDIS_DB = os.getenv('REDIS_DB')
-
-NEON_CONN_STR = f'postgresql+psycopg2://{NEON_DB_USER}:{NEON_DB_KEY}@{NEON_COMPUTE_NAME}.{NEON_LOCATION}.aws.neon.tech/{NEON_DB_NAME}'
-MONGO_CONN_STR = f'mongodb+srv://{MONGO_DB_USER}:{MONGO_DB_KEY}@{MONGO_DB_NAME}.l0wmrp9.mongodb.net/?retryWrites=true&w=majority'
-COCKROACH_CONN_STR = f'postgresql://{COCKROACH_USER}:{COCKROACH_PW}@{COCKROACH_HOST}:{COCKROACH_PORT}/{COCKROACH_DB}'
+DEFAULT_POOL_MINCONN = 1
+DEFAULT_POOL_MAXCONN = 4
+DEFAULT_POOL_MAX_IDLE = 300
+DEFAULT_POOL_CHECK_AFTER = 30
+DEFAULT_POOL_CHECKOUT_TIMEOUT = 30
+
+MONGO_CONN_TEMPLATE = 'mongodb+srv://{user}:{key}@{name}.l0wmrp9.mongodb.net/?retryWrites=true&w=majority'
 
 def pg_connection(conn_params: DBConstLoader) -> psycopg2.extensions.connection:
     '''Initiates backend PostgreSQL database connection'''
+    import psycopg2
     # engine = create_engine(conn_params.conn_str)
     conn = psycopg2.connect(host=conn_params.DB_HOST, 
                             dbname=conn_params.DB_NAME, 
@@ -55,25 +44,168 @@ def pg_connection(conn_params: DBConstLoader) -> psycopg2.extensions.connection:
 #     return client[conn_params.DB_NAME]
 
 def neondb_connection() -> psycopg2.extensions.connection:
-    '''Initiates backend PostgreSQL database connection via NEON DB host'''
-    engine = create_engine(NEON_CONN_STR)
-    conn = psycopg2.connect(host=f'{NEON_COMPUTE_NAME}.{NEON_LOCATION}.aws.neon.tech', 
-                            dbname=NEON_DB_NAME, 
-                            user=NEON_DB_USER, 
-                            password=NEON_DB_KEY, 
-                            port=NEON_PORT)
+    '''Initiates backend PostgreSQL database connection via NEON DB host, reading credentials from environment at call time'''
+    import psycopg2
+    conn = psycopg2.connect(host=f'{os.getenv("NEON_COMPUTE")}.{os.getenv("NEON_LOCATION")}.aws.neon.tech', 
+                            dbname=os.getenv('NEON_DB'), 
+                            user=os.getenv('NEON_USER'), 
+                            password=os.getenv('NEON_CONN_KEY'), 
+                            port=os.getenv('NEON_PORT'))
     return conn
 
-def mongodb_connection() -> pymongo.mongo_client.MongoClient:
-    '''Initiates backend MongoDB Atlas database connection'''
-    return pymongo.MongoClient(MONGO_CONN_STR)
+class PgPool:
+    '''
+    Thread-safe pool of reusable PostgreSQL connections.  Connections idle longer than `max_idle` are closed and replaced on checkout, and
+    connections idle longer than `check_after` are probed with `SELECT 1` before being handed out, so that dropped server-side connections
+    are replaced transparently.  Checked-in connections are rolled back if left inside a transaction.  When all connections are checked out,
+    callers wait up to `checkout_timeout` seconds for one to be returned instead of failing at once.
+
+    :params:
+    conn_params: DBConstLoader object - preset connection parameters based on data source loading
+    minconn: int - number of connections opened up front and kept open
+    maxconn: int - maximum number of connections checked out at once
+    max_idle: int - seconds after which idle connection is recycled
+    check_after: int - seconds of idleness after which connection is health-checked before reuse
+    checkout_timeout: float - seconds to wait for a free connection before raising `PoolError`; None waits indefinitely
+    '''
+    def __init__(
+        self, 
+        conn_params: DBConstLoader, 
+        minconn: int = DEFAULT_POOL_MINCONN, 
+        maxconn: int = DEFAULT_POOL_MAXCONN, 
+        max_idle: int = DEFAULT_POOL_MAX_IDLE, 
+        check_after: int = DEFAULT_POOL_CHECK_AFTER,
+        checkout_timeout: float | None = DEFAULT_POOL_CHECKOUT_TIMEOUT
+    ):
+        from psycopg2.pool import ThreadedConnectionPool
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.checkout_timeout = checkout_timeout
+        self._last_used = {}
+        self._lock = threading.Lock()
+        # ThreadedConnectionPool raises as soon as maxconn connections are out; checkouts queue on this semaphore instead
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._pool = ThreadedConnectionPool(
+            minconn, 
+            maxconn, 
+            host=conn_params.DB_HOST, 
+            dbname=conn_params.DB_NAME, 
+            user=conn_params.DB_USER, 
+            password=conn_params.DB_KEY, 
+            port=conn_params.DB_PORT
+        )
+
+    @staticmethod
+    def _is_healthy(conn: psycopg2.extensions.connection) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self) -> psycopg2.extensions.connection:
+        from psycopg2.pool import PoolError
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError(f'no connection returned to pool within {self.checkout_timeout} seconds')
+        try:
+            while True:
+                conn = self._pool.getconn()
+                with self._lock:
+                    _idle = time.monotonic() - self._last_used.pop(id(conn), time.monotonic())
+                if conn.closed or (_idle > self.max_idle) or ((_idle > self.check_after) and not self._is_healthy(conn)):
+                    self._pool.putconn(conn, close=True)
+                    continue
+                return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn: psycopg2.extensions.connection):
+        import psycopg2.extensions
+        if not conn.closed and (conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        if not conn.closed:
+            with self._lock:
+                self._last_used[id(conn)] = time.monotonic()
+        try:
+            self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        '''Checks out connection for duration of `with` block, rolling back on error and returning it to pool afterwards'''
+        conn = self._checkout()
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self._checkin(conn)
+
+    def close(self):
+        '''Closes all pooled connections'''
+        if not self._pool.closed:
+            self._pool.closeall()
+
+_PG_POOLS = {}
+_PG_POOLS_LOCK = threading.Lock()
+
+def _pool_key(conn_params: DBConstLoader) -> tuple:
+    # process id included so that forked workers never share parent's sockets
+    return (os.getpid(), conn_params.DB_HOST, conn_params.DB_PORT, conn_params.DB_NAME, conn_params.DB_USER)
+
+def get_pg_pool(conn_params: DBConstLoader | None = None, minconn: int = DEFAULT_POOL_MINCONN, maxconn: int = DEFAULT_POOL_MAXCONN) -> PgPool:
+    '''
+    Returns process-wide connection pool of given connection parameters, creating it on first call.  Pool size is fixed by the first caller.
+
+    :params:
+    conn_params: DBConstLoader object - optional, preset connection parameters; defaults to Neon database
+    minconn: int - number of connections kept open if pool has not been created yet
+    maxconn: int - maximum number of connections if pool has not been created yet
+    '''
+    _params = conn_params if conn_params is not None else DBConstLoader('gnews')
+    _key = _pool_key(_params)
+    with _PG_POOLS_LOCK:
+        if _key not in _PG_POOLS:
+            _PG_POOLS[_key] = PgPool(_params, minconn, maxconn)
+        return _PG_POOLS[_key]
+
+@contextmanager
+def pg_pooled_connection(conn_params: DBConstLoader | None = None):
+    '''Checks out connection from process-wide pool of given connection parameters for duration of `with` block'''
+    with get_pg_pool(conn_params).connection() as conn:
+        yield conn
+
+@atexit.register
+def close_pg_pools():
+    '''Closes all process-wide connection pools'''
+    with _PG_POOLS_LOCK:
+        for _pool in _PG_POOLS.values():
+            _pool.close()
+        _PG_POOLS.clear()
+
+def mongodb_connection(conn_params: DBConstLoader | None = None) -> pymongo.mongo_client.MongoClient:
+    '''Initiates backend MongoDB Atlas database connection, from preset connection parameters if given, else reading credentials from environment at call time'''
+    import pymongo
+    if conn_params is not None:
+        return pymongo.MongoClient(conn_params.conn_str)
+    return pymongo.MongoClient(MONGO_CONN_TEMPLATE.format(user=os.getenv('ATLAS_USER'), key=os.getenv('ATLAS_KEY'), name=os.getenv('ATLAS_DB')))
 
 
-def mongodb_get_db(client: pymongo.mongo_client.MongoClient) -> pymongo.database.Database:
+def mongodb_get_db(client: pymongo.mongo_client.MongoClient, conn_params: DBConstLoader | None = None) -> pymongo.database.Database:
     '''Enables MongoDB client to respective database'''
-    return client[MONGO_DB_NAME]
+    return client[conn_params.DB_NAME if conn_params is not None else os.getenv('ATLAS_DB')]
 
 def redis_connection(conn_params: DBConstLoader) -> redis.Redis:
     '''Initiates backend Redis connection'''
+    import redis
     rd = redis.Redis(host=conn_params.DB_HOST, port=conn_params.DB_PORT, password=conn_params.DB_KEY)
     return rd
\ No newline at end of file
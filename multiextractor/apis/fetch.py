@@ -0,0 +1,150 @@
+import asyncio
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from multidict import CIMultiDict
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_LIMIT_PER_HOST = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_DNS_TTL = 300
+
+def _accept_encoding() -> str:
+    '''Builds `Accept-Encoding` header value, advertising brotli only when a decoder is installed for aiohttp'''
+
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return 'gzip, deflate'
+    return 'gzip, deflate, br'
+
+ACCEPT_ENCODING = _accept_encoding()
+
+class FetchResponse:
+    '''
+    Container of fully-read HTTP response returned by `FetchEngine`.  Headers are kept case-insensitive, as sent by server.  `elapsed` is
+    time in seconds from acquiring a concurrency slot to reading full body.
+    '''
+    def __init__(self, url: str, status: int, headers: Mapping[str, str], body: bytes, elapsed: float = 0.0):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+class FetchEngine:
+    '''
+    Asynchronous HTTP fetch engine running over a single pooled `aiohttp` session.  Connections are kept alive and reused across requests,
+    limited per host, and all requests share a global concurrency cap.  Compressed bodies (gzip/deflate, brotli if available) are decoded on read.
+
+    :params:
+    max_concurrency: int - global cap of requests in flight at any one time
+    limit_per_host: int - cap of open connections to any single host
+    timeout: int - total timeout in seconds per request
+    headers: dict[str, str] - optional, default headers sent with every request
+    '''
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, limit_per_host: int = DEFAULT_LIMIT_PER_HOST, timeout: int = DEFAULT_TIMEOUT, headers: dict[str, str] | None = None):
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if headers is not None: self.headers.update(headers)
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return (self._session is None) or self._session.closed
+
+    async def open(self):
+        '''Creates pooled session and concurrency guard if not already open'''
+
+        if self.closed:
+            _connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=DEFAULT_DNS_TTL
+            )
+            self._session = aiohttp.ClientSession(
+                connector=_connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+                auto_decompress=True
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        '''Closes session and releases all pooled connections'''
+
+        if not self.closed:
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+
+    async def _get(self, url: str, headers: dict[str, str] | None, start: float) -> FetchResponse:
+        async with self._session.get(url, headers=headers) as resp:
+            _body = await resp.read()
+            return FetchResponse(str(resp.url), resp.status, CIMultiDict(resp.headers), _body, asyncio.get_running_loop().time() - start)
+
+    async def fetch(self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None) -> FetchResponse:
+        '''
+        Requests URL and reads full response body under global concurrency cap.
+
+        :params:
+        url: str - website URL to request
+        headers: dict[str, str] - optional, extra headers for this request only
+        timeout: float - optional, seconds allowed for request once a concurrency slot is held; time spent waiting for a slot is not counted
+        '''
+        await self.open()
+        async with self._semaphore:
+            return await asyncio.wait_for(self._get(url, headers, asyncio.get_running_loop().time()), timeout)
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: dict[str, str] | None = None):
+        '''
+        Requests URL and yields open `aiohttp` response with body left unread, so it can be consumed in chunks through `resp.content`.  The
+        concurrency slot is held until the context exits.
+
+        :params:
+        url: str - website URL to request
+        headers: dict[str, str] - optional, extra headers for this request only
+        '''
+        await self.open()
+        async with self._semaphore:
+            async with self._session.get(url, headers=headers) as resp:
+                yield resp
+
+async def _fetch_once(url: str, headers: dict[str, str] | None = None) -> FetchResponse:
+    async with FetchEngine(max_concurrency=1) as engine:
+        return await engine.fetch(url, headers=headers)
+
+def fetch_sync(url: str, headers: dict[str, str] | None = None) -> FetchResponse:
+    '''
+    Blocking single request over `FetchEngine`.  When called from a thread already running an event loop (e.g. Jupyter or an async caller),
+    the request runs on its own loop in a worker thread, since `asyncio.run` cannot be nested.
+
+    :params:
+    url: str - website URL to request
+    headers: dict[str, str] - optional, extra headers for this request
+    '''
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_fetch_once(url, headers=headers))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, _fetch_once(url, headers=headers)).result()
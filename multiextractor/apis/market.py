@@ -7,8 +7,6 @@ from multiextractor.constants import OPTIONS
 
 load_dotenv()
 
-ALPHAVANTAGE_KEY = os.getenv('ALPHAVANTAGE_API')
-
 URL_BASE = 'https://www.alphavantage.co/query?function={FUNCTION}{QUERY_PARAMS}&apikey={KEY}'
 
 def get_alphavan_data(category: str, tickers: str | None = None, **params) -> dict | list[dict]:
@@ -42,7 +40,7 @@ def get_alphavan_data(category: str, tickers: str | None = None, **params) -> di
     url = URL_BASE.format(
         FUNCTION=function,
         QUERY_PARAMS=query_params,
-        KEY=ALPHAVANTAGE_KEY
+        KEY=os.getenv('ALPHAVANTAGE_API')
     )
     
     r = requests.get(url)
@@ -1,27 +1,33 @@
 from dotenv import load_dotenv
 import urllib.request
-import feedparser
 import pandas as pd
 import tldextract
 from urllib.parse import urlparse
 from datetime import date, time
 import os
 import json
-import requests
+import hashlib
 import asyncio
-from bs4 import BeautifulSoup
-from concurrent.futures import ProcessPoolExecutor
-from multiextractor.transforms.soup_funcs import locate_elements, process_text
+import xml.etree.ElementTree as ET
+from multiextractor.apis.fetch import FetchEngine, fetch_sync, DEFAULT_MAX_CONCURRENCY
+from multiextractor.cache import FeedStateStore, ArticleCache, SeenIndex, normalize_url
+from multiextractor.workers import SharedExecutor
+from multiextractor.constants import SciDailyConstants as sci, TRANSLATOR
+from multiextractor.transforms.feeds import parse_feed, FeedPullParser, ITERPARSE_THRESHOLD, FEED_CHUNK_SIZE
+from multiextractor.transforms.soup_funcs import locate_elements, process_text, extract_date, parse_content, parse_rss_body, parse_scidaily_story, DEFAULT_PARSER
 
 load_dotenv()
 
-GNEWS_KEY = os.getenv('GNEWS_API')
+DEFAULT_ENTRY_TIMEOUT = 30
 
-def extract_news(**params) -> dict:
+RSS_COLUMNS = ['title', 'description', 'content', 'url', 'image', 'publishedAt', 'name', 'domainName', 'publishedDate', 'publishedTime']
+
+def extract_news(seen_index: SeenIndex | None = None, **params) -> dict:
     '''
     Extract news articles with GNews API
     
     :params:
+    seen_index: SeenIndex object - optional, index of already loaded articles; known articles are dropped from returned list
     **params: dict - custom parameters entered to build query string of URL for news extraction
     '''
     category = params.get('category', 'technology')
@@ -30,53 +36,110 @@ def extract_news(**params) -> dict:
     max_articles = params.get('max_articles', 10)
     
     url = "https://gnews.io/api/v4/top-headlines?category={category}&lang={language}&country={country}&max={max_articles}&apikey={key}".format(
-        category=category, language=language, country=country, max_articles=max_articles, key=GNEWS_KEY
+        category=category, language=language, country=country, max_articles=max_articles, key=os.getenv('GNEWS_API')
     )
     with urllib.request.urlopen(url) as response:
         data = json.loads(response.read().decode("utf-8"))
         articles = data["articles"]
+    if seen_index is not None:
+        articles = [article for article in articles if not seen_index.seen(article['url'])]
     return data, articles
     
-def extract_content(url: str, element_search: str, method: str, headers: dict[str, str] | None = None):
+async def _run_parse(executor: SharedExecutor | None, fn, *args):
+    '''Runs parsing step in shared worker pool when given, otherwise inline once body has been received'''
+    if executor is None:
+        return fn(*args)
+    return await executor.run(fn, *args)
+
+async def extract_content_async(engine: FetchEngine, url: str, element_search: str, method: str, headers: dict[str, str] | None = None, parser: str = DEFAULT_PARSER, partial: bool = True):
     '''
-    Extract news articles using conventional requests & BeautifulSoup
-    
+    Extract news articles over pooled fetch engine, parsing page only once full body has been received.
+
     :params:
+    engine: FetchEngine object - pooled HTTP session used for request
     url: str - webiste URL to scrape articles from
     element_search: str - search string to be used to identify specific elements for extraction as per method used
     method: str - method of searching.  Values given include `select` and `find`.
     headers: dict[str, str] -  optional, URL headers to be input into request API for additional protocol specifications on scraping
+    parser: str - BeautifulSoup parser backend used for page
+    partial: bool - if True, only subtrees matching `element_search` are parsed where possible
     '''
-    r = requests.get(url=url, headers=headers)
-    soup = BeautifulSoup(r.content, 'html5lib')
-    return locate_elements(soup, element_search, method)
+    resp = await engine.fetch(url, headers=headers)
+    return parse_content(resp.body, element_search, method, parser, partial)
 
-def extract_rss_body(url, body_attrs=None, list_attrs=None) -> str:
-    ''''''
-    _body_kwargs, _list_kwargs = {}, {}
-    r = requests.get(url)
-    soup = BeautifulSoup(r.content, 'lxml')
-    
-    if body_attrs is not None: _body_kwargs.update({'attrs': body_attrs})
-    _art_body = locate_elements(soup, 'div', 'find', **_body_kwargs)
+def extract_content(url: str, element_search: str, method: str, headers: dict[str, str] | None = None, parser: str = DEFAULT_PARSER, partial: bool = True):
+    '''
+    Extract news articles using fetch engine & BeautifulSoup
     
-    if list_attrs is not None: _list_kwargs.update({'attrs': list_attrs})
-    _body_list = process_text(_art_body, 'summary', 'find', 'div', **_list_kwargs)
-    return ' '.join(_body_list)
-
-async def parallel_rss_extract(executor: ProcessPoolExecutor, entry: object, body_attrs: dict[str, str] | None, list_attrs: dict[str, str] | None):
-    ''''''
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        executor,
-        extract_rss_body,
-        entry.link, 
-        body_attrs, 
-        list_attrs
-    ) if (body_attrs is not None) & (list_attrs is not None) else entry.summary
+    :params:
+    url: str - webiste URL to scrape articles from
+    element_search: str - search string to be used to identify specific elements for extraction as per method used
+    method: str - method of searching.  Values given include `select` and `find`.
+    headers: dict[str, str] -  optional, URL headers to be input into request API for additional protocol specifications on scraping
+    parser: str - BeautifulSoup parser backend used for page
+    partial: bool - if True, only subtrees matching `element_search` are parsed where possible
+    '''
+    resp = fetch_sync(url, headers=headers)
+    return parse_content(resp.body, element_search, method, parser, partial)
+
+async def extract_rss_body_async(engine: FetchEngine, url: str, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None, cache: ArticleCache | None = None, entry_hash: str | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, timeout: float | None = None) -> str:
+    '''
+    Fetches RSS article page over pooled fetch engine and extracts article body once full page has been received.
+    Cached bodies are returned without fetching or parsing the page.  A timeout covers fetching and parsing only, not waiting for a fetch slot.
+
+    :params:
+    engine: FetchEngine object - pooled HTTP session used for request
+    url: str - article URL linked from RSS entry
+    body_attrs: dict[str, str] - optional, attributes identifying article body element
+    list_attrs: dict[str, str] - optional, attributes identifying text blocks within article body
+    cache: ArticleCache object - optional, cache of previously extracted article bodies
+    entry_hash: str - optional, hash of feed entry used as part of cache key
+    parser: str - BeautifulSoup parser backend used for article page
+    executor: SharedExecutor object - optional, shared worker pool used for parsing
+    timeout: float - optional, seconds allowed for fetching and parsing article page
+    '''
+    if cache is not None:
+        _namespace = json.dumps([body_attrs, list_attrs], sort_keys=True)
+        _body = cache.get_article(url, entry_hash, _namespace)
+        if _body is not None:
+            return _body
+    resp = await engine.fetch(url, timeout=timeout)
+    _parse_timeout = max(timeout - resp.elapsed, 0) if timeout is not None else None
+    _body = await asyncio.wait_for(_run_parse(executor, parse_rss_body, resp.body, body_attrs, list_attrs, parser), _parse_timeout)
+    if cache is not None:
+        cache.set_article(url, _body, entry_hash, _namespace)
+    return _body
+
+def extract_rss_body(url: str, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None, parser: str = DEFAULT_PARSER) -> str:
+    '''
+    Blocking variant of `extract_rss_body_async` for single article pages.
+
+    :params:
+    url: str - article URL linked from RSS entry
+    body_attrs: dict[str, str] - optional, attributes identifying article body element
+    list_attrs: dict[str, str] - optional, attributes identifying text blocks within article body
+    parser: str - BeautifulSoup parser backend used for article page
+    '''
+    resp = fetch_sync(url)
+    return parse_rss_body(resp.body, body_attrs, list_attrs, parser)
+
+def _entry_guid(entry: object) -> str:
+    '''Returns GUID of RSS entry, falling back to its link'''
+    return entry.get('id', None) or entry.link
+
+def _entry_hash(entry: object) -> str:
+    '''Returns hash of RSS entry identity and revision, so that updated entries are treated as new content'''
+    _parts = [_entry_guid(entry), entry.get('updated', None) or entry.get('published', None) or '']
+    return hashlib.sha1('\x1f'.join(_parts).encode('utf-8')).hexdigest()
+
+async def parallel_rss_extract(engine: FetchEngine, entry: object, body_attrs: dict[str, str] | None, list_attrs: dict[str, str] | None, cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, timeout: float | None = None):
+    '''Extracts article body of RSS entry when body and list attributes are given, otherwise falls back to entry summary'''
+    if (body_attrs is not None) & (list_attrs is not None):
+        return await extract_rss_body_async(engine, entry.link, body_attrs, list_attrs, cache=cache, entry_hash=_entry_hash(entry), parser=parser, executor=executor, timeout=timeout)
+    return entry.summary
     
-async def populate_data_struct(executor: ProcessPoolExecutor, entry: object, body_attrs: dict[str, str] | None, list_attrs: dict[str, str] | None):
-    _summary = await parallel_rss_extract(executor, entry, body_attrs, list_attrs)
+async def populate_data_struct(engine: FetchEngine, entry: object, body_attrs: dict[str, str] | None, list_attrs: dict[str, str] | None, cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, timeout: float | None = None):
+    _summary = await parallel_rss_extract(engine, entry, body_attrs, list_attrs, cache=cache, parser=parser, executor=executor, timeout=timeout)
     return {
         'title': entry.title,
         'description': entry.summary,
@@ -90,11 +153,290 @@ async def populate_data_struct(executor: ProcessPoolExecutor, entry: object, bod
         'publishedTime': time(entry.published_parsed.tm_hour, entry.published_parsed.tm_min, entry.published_parsed.tm_sec)
     }   
 
-async def create_entry_from_rss(url: str, pool_num: int, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None) -> pd.DataFrame:
-    executor = ProcessPoolExecutor(pool_num)
-    
-    _feeds = feedparser.parse(url)
-    _entry_list = await asyncio.gather(*(populate_data_struct(executor, _entry, body_attrs, list_attrs) for _entry in _feeds.entries))
-    _df = pd.DataFrame(_entry_list)
+def _conditional_headers(state: dict) -> dict[str, str]:
+    '''Builds conditional request headers from stored feed validators'''
+    _headers = {}
+    if state['etag'] is not None: _headers['If-None-Match'] = state['etag']
+    if state['modified'] is not None: _headers['If-Modified-Since'] = state['modified']
+    return _headers
+
+async def _parse_feed_stream(resp, executor: SharedExecutor | None = None) -> list:
+    '''
+    Parses feed response body off the event loop.  Bodies of known size up to the iterparse threshold are read whole and parsed by
+    `parse_feed`; larger or unsized bodies are read in chunks fed into `FeedPullParser` as they arrive, so that the whole body is never
+    buffered.  Raises `xml.etree.ElementTree.ParseError` if a streamed body is not well-formed XML.
+    '''
+    if (resp.content_length is not None) and (resp.content_length <= ITERPARSE_THRESHOLD):
+        _body = await resp.read()
+        if executor is None:
+            return await asyncio.to_thread(parse_feed, _body)
+        return await executor.run(parse_feed, _body)
+
+    _parser = FeedPullParser()
+    _feed_entries = []
+    async for chunk in resp.content.iter_chunked(FEED_CHUNK_SIZE):
+        _feed_entries.extend(await asyncio.to_thread(_parser.feed, chunk))
+    _feed_entries.extend(await asyncio.to_thread(_parser.close))
+    return _feed_entries
+
+async def _select_rss_entries(engine: FetchEngine, url: str, feed_state: FeedStateStore | None = None, seen_index: SeenIndex | None = None, executor: SharedExecutor | None = None) -> tuple[list | None, dict | None]:
+    '''
+    Fetches RSS feed over fetch engine and parses body off the event loop as it is received, returning entries still to be extracted together
+    with the feed validators to be recorded once they have been extracted, or `(None, None)` if feed is unchanged since last conditional request.
+    Feeds that are not well-formed XML are fetched again in full and parsed by feedparser.  Entries are deduplicated by seen index only, which
+    holds articles whose load was committed, so that entries of a failed load are extracted again.
+    '''
+    _state = feed_state.get(url) if feed_state is not None else None
+    _headers = _conditional_headers(_state) if _state is not None else None
+    try:
+        async with engine.stream(url, headers=_headers) as resp:
+            if (resp.status == 304) and (feed_state is not None):
+                return None, None
+            if not (200 <= resp.status < 300):
+                raise Exception(f'Feed request failed with status {resp.status}: {url}')
+            _pending_state = {'etag': resp.headers.get('ETag', None), 'modified': resp.headers.get('Last-Modified', None)}
+            _feed_entries = await _parse_feed_stream(resp, executor)
+    except ET.ParseError:
+        resp = await engine.fetch(url, headers=_headers)
+        if (resp.status == 304) and (feed_state is not None):
+            return None, None
+        if not resp.ok:
+            raise Exception(f'Feed request failed with status {resp.status}: {url}')
+        _pending_state = {'etag': resp.headers.get('ETag', None), 'modified': resp.headers.get('Last-Modified', None)}
+        if executor is None:
+            _feed_entries = await asyncio.to_thread(parse_feed, resp.body, len(resp.body))
+        else:
+            _feed_entries = await executor.run(parse_feed, resp.body, len(resp.body))
+
+    _entries = _feed_entries
+    if seen_index is not None:
+        _entries = [_entry for _entry in _entries if not seen_index.seen(_entry.link)]
+    return _entries, _pending_state
+
+def _record_feed_state(feed_state: FeedStateStore | None, url: str, pending_state: dict | None):
+    '''Records validators of feed response once every selected entry was extracted'''
+    if (feed_state is None) or (pending_state is None):
+        return
+    feed_state.update(url, etag=pending_state['etag'], modified=pending_state['modified'])
+
+def _build_rss_frame(entry_list: list[dict]) -> pd.DataFrame:
+    '''Builds article table from populated RSS entries'''
+    _df = pd.DataFrame(entry_list, columns=RSS_COLUMNS)
     _df['publishedAt'] = pd.to_datetime(_df['publishedAt']).dt.strftime('%Y%m%d %H:%M:%S%z+00:00')
-    return _df
\ No newline at end of file
+    return _df
+
+async def create_entry_from_rss(url: str, pool_num: int = DEFAULT_MAX_CONCURRENCY, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None, engine: FetchEngine | None = None, feed_state: FeedStateStore | None = None, article_cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, seen_index: SeenIndex | None = None) -> pd.DataFrame:
+    '''
+    Builds article table from RSS feed, fetching feed and all linked article bodies concurrently over pooled fetch engine.  The feed body is parsed
+    off the event loop, in the shared worker pool if given or a worker thread otherwise.
+    When a feed state store is given, the feed is requested conditionally and an empty table is returned if the server answers `304 Not Modified`;
+    feed validators are only recorded once all entries have been extracted.  Article bodies found in the article cache are not re-fetched, and
+    entries already in the seen index are dropped before any article request; entries are not deduplicated by GUID, so that articles extracted
+    but not loaded are picked up again on next poll of a changed feed.
+
+    :params:
+    url: str - RSS feed URL
+    pool_num: int - global cap of concurrent article requests when no engine is given
+    body_attrs: dict[str, str] - optional, attributes identifying article body element
+    list_attrs: dict[str, str] - optional, attributes identifying text blocks within article body
+    engine: FetchEngine object - optional, shared fetch engine; created and closed per call if not given
+    feed_state: FeedStateStore object - optional, persistent ETag / Last-Modified store for conditional requests
+    article_cache: ArticleCache object - optional, cache of previously extracted article bodies
+    parser: str - BeautifulSoup parser backend used for article pages of this feed
+    executor: SharedExecutor object - optional, shared worker pool used for parsing feed and article pages
+    seen_index: SeenIndex object - optional, index of already loaded articles
+    '''
+    if engine is None:
+        async with FetchEngine(max_concurrency=pool_num) as _engine:
+            return await create_entry_from_rss(url, pool_num, body_attrs, list_attrs, _engine, feed_state, article_cache, parser, executor, seen_index)
+
+    _entries, _pending_state = await _select_rss_entries(engine, url, feed_state, seen_index, executor)
+    if _entries is None:
+        return pd.DataFrame(columns=RSS_COLUMNS)
+    _entry_list = await asyncio.gather(*(populate_data_struct(engine, _entry, body_attrs, list_attrs, cache=article_cache, parser=parser, executor=executor) for _entry in _entries))
+    _record_feed_state(feed_state, url, _pending_state)
+    return _build_rss_frame(_entry_list)
+
+async def stream_entries_from_rss(url: str, pool_num: int = DEFAULT_MAX_CONCURRENCY, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None, engine: FetchEngine | None = None, feed_state: FeedStateStore | None = None, article_cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, seen_index: SeenIndex | None = None, batch_size: int = 1, entry_timeout: float = DEFAULT_ENTRY_TIMEOUT, retries: int = 1):
+    '''
+    Streaming variant of `create_entry_from_rss`.  Yields `(articles, dropped)` pairs as soon as entries are populated, in completion order:
+    an article table of up to `batch_size` rows, and a list of entries given up since previous pair, each as dict with `url`, `attempts` and
+    `reason`.  If entries are given up after last full batch, a final pair with an empty table reports them.
+    Each attempt is timed from acquiring a fetch slot, so that entries queued behind others are not timed out; entries exceeding the timeout
+    are retried in the background while other entries keep streaming, and dropped once retries are exhausted.
+    Feed validators are only recorded once the stream has been consumed to the end with no entry dropped, so that a load failing mid-stream
+    does not hide remaining entries behind a `304 Not Modified`.
+
+    :params:
+    url: str - RSS feed URL
+    pool_num: int - global cap of concurrent article requests when no engine is given
+    body_attrs: dict[str, str] - optional, attributes identifying article body element
+    list_attrs: dict[str, str] - optional, attributes identifying text blocks within article body
+    engine: FetchEngine object - optional, shared fetch engine; created and closed with the stream if not given
+    feed_state: FeedStateStore object - optional, persistent ETag / Last-Modified store for conditional requests
+    article_cache: ArticleCache object - optional, cache of previously extracted article bodies
+    parser: str - BeautifulSoup parser backend used for article pages of this feed
+    executor: SharedExecutor object - optional, shared worker pool used for parsing article pages
+    seen_index: SeenIndex object - optional, index of already loaded articles
+    batch_size: int - maximum number of rows per yielded table
+    entry_timeout: float - seconds allowed per entry attempt for fetching and parsing article page
+    retries: int - number of further attempts for entries that time out
+    '''
+    if engine is None:
+        async with FetchEngine(max_concurrency=pool_num) as _engine:
+            async for _batch in stream_entries_from_rss(url, pool_num, body_attrs, list_attrs, _engine, feed_state, article_cache, parser, executor, seen_index, batch_size, entry_timeout, retries):
+                yield _batch
+        return
+
+    _entries, _pending_state = await _select_rss_entries(engine, url, feed_state, seen_index, executor)
+    if _entries is None:
+        return
+    if len(_entries) == 0:
+        _record_feed_state(feed_state, url, _pending_state)
+        return
+
+    _pending = {}
+    def _schedule(entry: object, attempt: int):
+        _task = asyncio.ensure_future(populate_data_struct(engine, entry, body_attrs, list_attrs, cache=article_cache, parser=parser, executor=executor, timeout=entry_timeout))
+        _pending[_task] = (entry, attempt)
+
+    for _entry in _entries:
+        _schedule(_entry, 0)
+
+    _batch, _dropped = [], []
+    _any_dropped = False
+    try:
+        while len(_pending) > 0:
+            _done, _ = await asyncio.wait(_pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for _task in _done:
+                _entry, _attempt = _pending.pop(_task)
+                try:
+                    _batch.append(_task.result())
+                except asyncio.TimeoutError:
+                    if _attempt < retries:
+                        _schedule(_entry, _attempt + 1)
+                    else:
+                        _dropped.append({'url': _entry.link, 'attempts': _attempt + 1, 'reason': 'timeout'})
+                except Exception as e:
+                    _dropped.append({'url': _entry.link, 'attempts': _attempt + 1, 'reason': str(e) or type(e).__name__})
+                if len(_batch) >= batch_size:
+                    _frame = _build_rss_frame(_batch)
+                    _any_dropped |= len(_dropped) > 0
+                    _batch, _dropped_batch, _dropped = [], _dropped, []
+                    yield _frame, _dropped_batch
+        if (len(_batch) > 0) or (len(_dropped) > 0):
+            _any_dropped |= len(_dropped) > 0
+            yield _build_rss_frame(_batch), _dropped
+    finally:
+        for _task in _pending:
+            _task.cancel()
+    # only reached when consumer asked for more after last batch, i.e. every batch was handled without error
+    if not _any_dropped:
+        _record_feed_state(feed_state, url, _pending_state)
+
+async def extract_rss_feeds(feed_specs: list[dict], max_concurrency: int = DEFAULT_MAX_CONCURRENCY, engine: FetchEngine | None = None, feed_state: FeedStateStore | None = None, article_cache: ArticleCache | None = None, executor: SharedExecutor | None = None, seen_index: SeenIndex | None = None) -> pd.DataFrame:
+    '''
+    Fetches several RSS feeds and their article bodies concurrently under one global concurrency budget, and merges them into a single article
+    table with a `source` column.  Articles appearing in more than one feed are kept once, by normalized URL and then by title.
+    Feeds that fail are reported and skipped.
+
+    :params:
+    feed_specs: list of dict - feed specifications with `url`, `source` and optional `body_attrs`, `list_attrs` and `parser` keys
+    max_concurrency: int - global cap of concurrent requests across all feeds when no engine is given
+    engine: FetchEngine object - optional, shared fetch engine; created and closed per call if not given
+    feed_state: FeedStateStore object - optional, persistent ETag / Last-Modified store for conditional requests
+    article_cache: ArticleCache object - optional, cache of previously extracted article bodies
+    executor: SharedExecutor object - optional, shared worker pool used for parsing article pages
+    seen_index: SeenIndex object - optional, index of already loaded articles
+    '''
+    if engine is None:
+        async with FetchEngine(max_concurrency=max_concurrency) as _engine:
+            return await extract_rss_feeds(feed_specs, max_concurrency, _engine, feed_state, article_cache, executor, seen_index)
+
+    _results = await asyncio.gather(*(
+        create_entry_from_rss(
+            spec['url'],
+            body_attrs=spec.get('body_attrs', None),
+            list_attrs=spec.get('list_attrs', None),
+            engine=engine,
+            feed_state=feed_state,
+            article_cache=article_cache,
+            parser=spec.get('parser', DEFAULT_PARSER),
+            executor=executor,
+            seen_index=seen_index
+        ) for spec in feed_specs
+    ), return_exceptions=True)
+
+    _frames = []
+    for spec, result in zip(feed_specs, _results):
+        if isinstance(result, Exception):
+            print(result)
+            print(f'Error encountered in feed extraction process: {spec["url"]}')
+            continue
+        _frames.append(result.assign(source=spec.get('source', urlparse(spec['url']).netloc)))
+    if len(_frames) == 0:
+        return pd.DataFrame(columns=RSS_COLUMNS + ['source'])
+
+    _df = pd.concat(_frames, ignore_index=True)
+    _url_keys = _df['url'].map(normalize_url)
+    _title_keys = _df['title'].str.casefold().str.strip()
+    _df = _df[~_url_keys.duplicated() & ~_title_keys.duplicated()]
+    return _df.reset_index(drop=True)
+
+async def _extract_scidaily_story(engine: FetchEngine, semaphore: asyncio.Semaphore, url: str, cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None) -> str:
+    '''Fetches and extracts text of single Science Daily story, served from article cache where possible'''
+    if cache is not None:
+        _story = cache.get_article(url)
+        if _story is not None:
+            return _story
+    async with semaphore:
+        resp = await engine.fetch(url)
+    _story = await _run_parse(executor, parse_scidaily_story, resp.body, parser)
+    if cache is not None:
+        cache.set_article(url, _story)
+    return _story
+
+async def extract_scidaily(max_workers: int = DEFAULT_MAX_CONCURRENCY, engine: FetchEngine | None = None, article_cache: ArticleCache | None = None, parser: str = DEFAULT_PARSER, executor: SharedExecutor | None = None, seen_index: SeenIndex | None = None) -> pd.DataFrame:
+    '''
+    Extracts latest Science Daily headlines and fetches every linked story concurrently, bounded by worker count.  Titles, summaries, story texts,
+    URLs and publish dates are kept aligned by headline order.  Stories already in the seen index are dropped before their pages are requested.
+    
+    :params:
+    max_workers: int - maximum number of story pages fetched at once
+    engine: FetchEngine object - optional, shared fetch engine; created and closed per call if not given
+    article_cache: ArticleCache object - optional, cache of previously extracted story texts
+    parser: str - BeautifulSoup parser backend used for headline and story pages
+    executor: SharedExecutor object - optional, shared worker pool used for parsing story pages
+    seen_index: SeenIndex object - optional, index of already loaded articles
+    '''
+    if engine is None:
+        async with FetchEngine(max_concurrency=max_workers, headers=sci.SCI_HEADERS) as _engine:
+            return await extract_scidaily(max_workers, _engine, article_cache, parser, executor, seen_index)
+
+    soup_heroes = (await extract_content_async(engine, sci.SCI_URL_FULL, 'div[id*="heroes"]', 'select', parser=parser))[0]
+    soup_latests = locate_elements(soup_heroes, 'div[class*="latest-head"]', 'select')
+    article_titles = process_text(soup_heroes, 'title', method='select', element_search='div[class*="latest-head"]')
+    article_summary = process_text(soup_heroes, 'summary', method='select', element_search='div[class*="latest-summary"]', translator=TRANSLATOR)
+
+    _hrefs = [locate_elements(soup_latest, 'a', 'find')['href'] for soup_latest in soup_latests]
+    url_list = [sci.SCI_DOMAIN_NAME + href for href in _hrefs]
+    pub_date_full_list = [extract_date(href) for href in _hrefs]
+    if seen_index is not None:
+        _keep = seen_index.filter_new(url_list)
+        article_titles, article_summary, url_list, pub_date_full_list = (
+            [val for val, keep in zip(vals, _keep) if keep] for vals in (article_titles, article_summary, url_list, pub_date_full_list)
+        )
+
+    _semaphore = asyncio.Semaphore(max_workers)
+    story_list = await asyncio.gather(*(_extract_scidaily_story(engine, _semaphore, url, article_cache, parser, executor) for url in url_list))
+    
+    return pd.DataFrame({
+        'title': article_titles,
+        'description': article_summary,
+        'content': story_list,
+        'url': url_list,
+        'image': '',
+        'publishedAt': pub_date_full_list,
+        'name': sci.SCI_SITE_NAME,
+        'domainName': sci.SCI_DOMAIN_NAME
+    })
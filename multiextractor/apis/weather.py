@@ -8,8 +8,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class WeatherBuilder(ABC):
+    _key_env = None
+
     def __init__(self):
         super.__init__()
+
+    @property
+    def _key(self):
+        # API key read from environment at use time rather than at class definition, so importing module needs no credentials
+        return os.environ[self._key_env]
     
     @abstractmethod
     def __select_url(cls, category):
@@ -57,7 +64,7 @@ class IQAirBuilder(WeatherBuilder):
     _states_url = 'http://api.airvisual.com/v2/states?country={country}&key={key}'
     _cities_url = 'http://api.airvisual.com/v2/cities?state={state}&country={country}&key={key}'
     _data_url = 'http://api.airvisual.com/v2/city?city={city}&state={state}&country={country}&key={key}'
-    _key = os.environ['IQ_AIR_KEY']
+    _key_env = 'IQ_AIR_KEY'
     
     def __init__(self, category):
         self.response = None
@@ -166,7 +173,7 @@ class OpenWeatherBuilder(WeatherBuilder):
     _geo_url = 'http://api.openweathermap.org/geo/1.0/direct?q={city}&limit={limit}&appid={key}'
     _forecast_url = 'https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={key}&units=metric'
     _current_url = 'https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={key}&units=metric'
-    _key = os.environ['OPEN_WEATHER_KEY']
+    _key_env = 'OPEN_WEATHER_KEY'
     
     def __init__(self, category):
         self.response = None
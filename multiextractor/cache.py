@@ -0,0 +1,481 @@
+import os
+import json
+import time
+import sqlite3
+import math
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from multiextractor.constants import CACHE_DIR
+
+FEED_STATE_FILE = 'feed_state.json'
+MAX_FEED_GUIDS = 1000
+
+ARTICLE_CACHE_FILE = 'articles.sqlite'
+ARTICLE_CACHE_MAX_ENTRIES = 5000
+ARTICLE_CACHE_TTL = 7 * 24 * 60 * 60
+
+TEXT_STATS_CACHE_FILE = 'text_stats.sqlite'
+TEXT_STATS_CACHE_MAX_ENTRIES = 200000
+
+SQLITE_MAX_PARAMS = 500
+ACCESS_FLUSH_THRESHOLD = 1000
+
+SEEN_INDEX_FILE = 'seen.sqlite'
+SEEN_INDEX_EXPECTED_ITEMS = 100000
+SEEN_INDEX_FP_RATE = 0.01
+
+TRACKING_PARAM_PREFIXES = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+def _atomic_write_json(path: str, data: dict):
+    '''Writes JSON to temporary file and swaps into place so readers never see partial state'''
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    _tmp_path = f'{path}.tmp'
+    with open(_tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(_tmp_path, path)
+
+class FeedStateStore:
+    '''
+    Persistent on-disk store of RSS feed state for conditional GET requests.  Keeps `ETag`, `Last-Modified` and recently seen entry GUIDs per feed URL.
+
+    :params:
+    path: str - optional, location of JSON state file; defaults to `feed_state.json` under `CACHE_DIR`
+    max_guids: int - number of most recent entry GUIDs retained per feed
+    '''
+    def __init__(self, path: str | None = None, max_guids: int = MAX_FEED_GUIDS):
+        self.path = path if path is not None else os.path.join(CACHE_DIR, FEED_STATE_FILE)
+        self.max_guids = max_guids
+        self._lock = threading.Lock()
+        self._state = self._read()
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, url: str) -> dict:
+        '''Returns stored state of feed URL, with `etag`, `modified` and `guids` keys'''
+        _state = self._state.get(url, {})
+        return {
+            'etag': _state.get('etag', None),
+            'modified': _state.get('modified', None),
+            'guids': _state.get('guids', [])
+        }
+
+    def update(self, url: str, etag: str | None = None, modified: str | None = None, guids: list[str] | None = None):
+        '''
+        Records validators and newly seen entry GUIDs of feed URL and persists store to disk.
+
+        :params:
+        url: str - RSS feed URL
+        etag: str - optional, `ETag` header returned by server
+        modified: str - optional, `Last-Modified` header returned by server
+        guids: list of str - optional, entry GUIDs seen in latest response
+        '''
+        with self._lock:
+            _prev = self.get(url)
+            _guids = list(dict.fromkeys((guids or []) + _prev['guids']))[:self.max_guids]
+            self._state[url] = {
+                'etag': etag if etag is not None else _prev['etag'],
+                'modified': modified if modified is not None else _prev['modified'],
+                'guids': _guids
+            }
+            _atomic_write_json(self.path, self._state)
+
+    def clear(self, url: str | None = None):
+        '''Removes state of given feed URL, or of all feeds if none given'''
+        with self._lock:
+            if url is None:
+                self._state = {}
+            else:
+                self._state.pop(url, None)
+            _atomic_write_json(self.path, self._state)
+
+def normalize_url(url: str) -> str:
+    '''
+    Normalizes URL for use as cache key.  Lowercases scheme and host, drops fragment, default ports, tracking query parameters and trailing slash, and sorts remaining query parameters.
+
+    :params:
+    url: str - URL to normalize
+    '''
+    _parts = urlsplit(url.strip())
+    _scheme = _parts.scheme.lower()
+    _netloc = _parts.netloc.lower()
+    if (_scheme, _netloc.rsplit(':', 1)[-1]) in [('http', '80'), ('https', '443')]:
+        _netloc = _netloc.rsplit(':', 1)[0]
+    _query = sorted((k, v) for k, v in parse_qsl(_parts.query, keep_blank_values=True) if not k.lower().startswith(TRACKING_PARAM_PREFIXES))
+    _path = _parts.path.rstrip('/') or '/'
+    return urlunsplit((_scheme, _netloc, _path, urlencode(_query), ''))
+
+class DiskCache:
+    '''
+    Bounded on-disk key-value cache backed by SQLite.  Entries expire after a time-to-live and the least recently used entries are evicted once
+    the size bound is exceeded.  Hit and miss counters are kept per instance.  Access times of hits are held in memory and written in one batch
+    on next write, on close or once `ACCESS_FLUSH_THRESHOLD` hits are pending, so that reads do not write to disk.
+
+    :params:
+    path: str - location of SQLite cache file
+    max_entries: int - size bound of cache, beyond which least recently used entries are evicted
+    ttl: int or None - time-to-live of entries in seconds; entries never expire if None
+    '''
+    def __init__(self, path: str, max_entries: int, ttl: int | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._accessed = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, created REAL, accessed REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._conn.commit()
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return (self.ttl is not None) and (now - created > self.ttl)
+
+    def _flush_accessed(self):
+        # caller holds lock; commit is left to caller
+        if len(self._accessed) > 0:
+            self._conn.executemany('UPDATE entries SET accessed = ? WHERE key = ?', [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _touch(self, keys: list[str], now: float):
+        # caller holds lock
+        self._accessed.update(dict.fromkeys(keys, now))
+        if len(self._accessed) >= ACCESS_FLUSH_THRESHOLD:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def get(self, key: str):
+        '''Returns cached value of key, or None if absent or expired'''
+        _now = time.time()
+        with self._lock:
+            _row = self._conn.execute('SELECT value, created FROM entries WHERE key = ?', (key,)).fetchone()
+            if (_row is None) or self._is_expired(_row[1], _now):
+                if _row is not None:
+                    self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._touch([key], _now)
+            self.hits += 1
+            return json.loads(_row[0])
+
+    def set(self, key: str, value):
+        '''Stores JSON-serializable value under key and evicts least recently used entries beyond size bound'''
+        _now = time.time()
+        with self._lock:
+            self._flush_accessed()
+            self._conn.execute(
+                'INSERT INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, created = excluded.created, accessed = excluded.accessed',
+                (key, json.dumps(value), _now, _now)
+            )
+            _excess = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - self.max_entries
+            if _excess > 0:
+                self._conn.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)', (_excess,))
+            self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict:
+        '''Returns cached values of all keys present and not expired, counting a hit or miss per key'''
+        _now = time.time()
+        _keys = list(dict.fromkeys(keys))
+        _found = {}
+        with self._lock:
+            for i in range(0, len(_keys), SQLITE_MAX_PARAMS):
+                _chunk = _keys[i:i + SQLITE_MAX_PARAMS]
+                _rows = self._conn.execute(f'SELECT key, value, created FROM entries WHERE key IN ({",".join("?" * len(_chunk))})', _chunk).fetchall()
+                _found.update({key: json.loads(value) for key, value, created in _rows if not self._is_expired(created, _now)})
+            self._touch(list(_found), _now)
+            self.hits += len(_found)
+            self.misses += len(_keys) - len(_found)
+        return _found
+
+    def set_many(self, items: dict):
+        '''Stores JSON-serializable values of all keys in one transaction and evicts least recently used entries beyond size bound'''
+        _now = time.time()
+        with self._lock:
+            self._flush_accessed()
+            self._conn.executemany(
+                'INSERT INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, created = excluded.created, accessed = excluded.accessed',
+                [(key, json.dumps(value), _now, _now) for key, value in items.items()]
+            )
+            _excess = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - self.max_entries
+            if _excess > 0:
+                self._conn.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)', (_excess,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        '''Deletes all expired entries and returns number removed'''
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            _cur = self._conn.execute('DELETE FROM entries WHERE created < ?', (time.time() - self.ttl,))
+            self._conn.commit()
+            return _cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self) -> dict:
+        '''Returns hit/miss counters, hit rate and current size of cache'''
+        _total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / _total if _total > 0 else 0.0,
+            'size': len(self),
+            'max_entries': self.max_entries
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+class ArticleCache(DiskCache):
+    '''
+    Content-addressed cache of extracted article bodies, keyed by hash of normalized article URL and optionally the feed entry hash.
+
+    :params:
+    path: str - optional, location of SQLite cache file; defaults to `articles.sqlite` under `CACHE_DIR`
+    max_entries: int - size bound of cache, beyond which least recently used entries are evicted
+    ttl: int or None - time-to-live of cached article bodies in seconds
+    '''
+    def __init__(self, path: str | None = None, max_entries: int = ARTICLE_CACHE_MAX_ENTRIES, ttl: int | None = ARTICLE_CACHE_TTL):
+        _path = path if path is not None else os.path.join(CACHE_DIR, ARTICLE_CACHE_FILE)
+        super().__init__(_path, max_entries, ttl)
+
+    @staticmethod
+    def make_key(url: str, entry_hash: str | None = None, namespace: str = '') -> str:
+        '''
+        Builds content address of article.
+
+        :params:
+        url: str - article URL
+        entry_hash: str - optional, hash of feed entry so that updated entries are re-extracted
+        namespace: str - optional, identifier of extraction settings (e.g. element attributes) used for article body
+        '''
+        _parts = [namespace, normalize_url(url), entry_hash or '']
+        return hashlib.sha256('\x1f'.join(_parts).encode('utf-8')).hexdigest()
+
+    def get_article(self, url: str, entry_hash: str | None = None, namespace: str = '') -> str | None:
+        return self.get(self.make_key(url, entry_hash, namespace))
+
+    def set_article(self, url: str, body: str, entry_hash: str | None = None, namespace: str = ''):
+        self.set(self.make_key(url, entry_hash, namespace), body)
+
+class TextStatsCache(DiskCache):
+    '''
+    Memo cache of text statistics, keyed by hash of text together with fingerprint of NLP pipeline and statistics version, so that
+    results are recomputed whenever the model or counting logic changes.
+
+    :params:
+    path: str - optional, location of SQLite cache file; defaults to `text_stats.sqlite` under `CACHE_DIR`
+    max_entries: int - size bound of cache, beyond which least recently used entries are evicted
+    ttl: int or None - optional, time-to-live of entries in seconds
+    '''
+    def __init__(self, path: str | None = None, max_entries: int = TEXT_STATS_CACHE_MAX_ENTRIES, ttl: int | None = None):
+        _path = path if path is not None else os.path.join(CACHE_DIR, TEXT_STATS_CACHE_FILE)
+        super().__init__(_path, max_entries, ttl)
+
+    @staticmethod
+    def make_key(text: str, fingerprint: str) -> str:
+        '''
+        Builds key of text statistics.
+
+        :params:
+        text: str - profiled text
+        fingerprint: str - identifier of NLP pipeline and statistics version
+        '''
+        return hashlib.sha256(f'{fingerprint}\x1f{text}'.encode('utf-8')).hexdigest()
+
+class BloomFilter:
+    '''
+    Fixed-size Bloom filter using double hashing over a single BLAKE2b digest.
+
+    :params:
+    num_bits: int - size of bit array
+    num_hashes: int - number of bit positions set per item
+    bits: bytearray - optional, existing bit array to load
+    '''
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytearray | None = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def for_capacity(cls, expected_items: int, fp_rate: float):
+        '''Sizes filter for expected number of items at target false-positive rate'''
+        _n = max(expected_items, 1)
+        _m = math.ceil(-_n * math.log(fp_rate) / (math.log(2) ** 2))
+        _k = max(1, round(_m / _n * math.log(2)))
+        return cls(_m, _k)
+
+    def _positions(self, key: str):
+        _digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        _h1, _h2 = int.from_bytes(_digest[:8], 'little'), int.from_bytes(_digest[8:], 'little') | 1
+        return ((_h1 + i * _h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def estimated_fp_rate(self) -> float:
+        '''Theoretical false-positive rate given number of items added'''
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path: str):
+        _header = json.dumps({'num_bits': self.num_bits, 'num_hashes': self.num_hashes, 'count': self.count}).encode('utf-8')
+        _tmp_path = f'{path}.tmp'
+        with open(_tmp_path, 'wb') as f:
+            f.write(len(_header).to_bytes(4, 'little'))
+            f.write(_header)
+            f.write(self.bits)
+        os.replace(_tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'rb') as f:
+            _header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+            _bloom = cls(_header['num_bits'], _header['num_hashes'], bytearray(f.read()))
+        _bloom.count = _header['count']
+        return _bloom
+
+class SeenIndex:
+    '''
+    Persistent cross-run index of already loaded articles.  An on-disk Bloom filter answers most lookups for unseen articles without touching disk,
+    and positives are confirmed against an exact SQLite key store.  Articles are keyed by hash of normalized URL, or of title when no URL is given.
+
+    :params:
+    path: str - optional, location of SQLite key store; Bloom filter is kept alongside with `.bloom` suffix.  Defaults to `seen.sqlite` under `CACHE_DIR`
+    expected_items: int - number of articles Bloom filter is sized for
+    fp_rate: float - target false-positive rate of Bloom filter
+    '''
+    def __init__(self, path: str | None = None, expected_items: int = SEEN_INDEX_EXPECTED_ITEMS, fp_rate: float = SEEN_INDEX_FP_RATE):
+        self.path = path if path is not None else os.path.join(CACHE_DIR, SEEN_INDEX_FILE)
+        self.bloom_path = f'{self.path}.bloom'
+        self.expected_items = expected_items
+        self.fp_rate = fp_rate
+        self.lookups = 0
+        self.bloom_positives = 0
+        self.false_positives = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, added REAL)')
+        self._conn.commit()
+        self._bloom = BloomFilter.load(self.bloom_path) if os.path.exists(self.bloom_path) else self._rebuild_bloom()
+        # item count of filters saved by earlier versions may include repeated keys; exact store is authoritative
+        self._bloom.count = self._conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    @staticmethod
+    def make_key(value: str) -> str:
+        '''Builds index key from article URL, or from title if value is not a URL'''
+        _value = value.strip()
+        _norm = normalize_url(_value) if _value.lower().startswith(('http://', 'https://')) else ' '.join(_value.casefold().split())
+        return hashlib.sha1(_norm.encode('utf-8')).hexdigest()
+
+    def _rebuild_bloom(self) -> BloomFilter:
+        _count = self._conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        _bloom = BloomFilter.for_capacity(max(self.expected_items, 2 * _count), self.fp_rate)
+        for (key,) in self._conn.execute('SELECT key FROM seen'):
+            _bloom.add(key)
+        _bloom.save(self.bloom_path)
+        return _bloom
+
+    def seen(self, value: str) -> bool:
+        '''Returns True if article URL or title was previously added'''
+        _key = self.make_key(value)
+        with self._lock:
+            self.lookups += 1
+            if _key not in self._bloom:
+                return False
+            self.bloom_positives += 1
+            _found = self._conn.execute('SELECT 1 FROM seen WHERE key = ?', (_key,)).fetchone() is not None
+            if not _found:
+                self.false_positives += 1
+            return _found
+
+    def filter_new(self, values: list[str]) -> list[bool]:
+        '''Returns mask marking which of the given URLs or titles have not been seen'''
+        return [not self.seen(value) for value in values]
+
+    def add(self, values: list[str]):
+        '''
+        Records articles as seen and persists index.
+
+        :params:
+        values: list of str - article URLs or titles
+        '''
+        _now = time.time()
+        _keys = list(dict.fromkeys(self.make_key(value) for value in values if isinstance(value, str) and value.strip() != ''))
+        with self._lock:
+            _known = set()
+            for i in range(0, len(_keys), SQLITE_MAX_PARAMS):
+                _chunk = _keys[i:i + SQLITE_MAX_PARAMS]
+                _known.update(key for (key,) in self._conn.execute(f'SELECT key FROM seen WHERE key IN ({",".join("?" * len(_chunk))})', _chunk))
+            # only keys newly stored are added to Bloom filter, so that its item count stays exact
+            _new_keys = [key for key in _keys if key not in _known]
+            if len(_new_keys) == 0:
+                return
+            self._conn.executemany('INSERT INTO seen (key, added) VALUES (?, ?)', [(key, _now) for key in _new_keys])
+            self._conn.commit()
+            for key in _new_keys:
+                self._bloom.add(key)
+            self._bloom.save(self.bloom_path)
+
+    def compact(self, max_age: int | None = None) -> int:
+        '''
+        Drops entries older than given age from exact store and rebuilds Bloom filter from remaining keys, resetting accumulated false positives.
+        Returns number of entries removed.
+
+        :params:
+        max_age: int - optional, age in seconds beyond which entries are dropped
+        '''
+        with self._lock:
+            _removed = 0
+            if max_age is not None:
+                _removed = self._conn.execute('DELETE FROM seen WHERE added < ?', (time.time() - max_age,)).rowcount
+                self._conn.commit()
+            self._conn.execute('VACUUM')
+            self._bloom = self._rebuild_bloom()
+            self.lookups, self.bloom_positives, self.false_positives = 0, 0, 0
+            return _removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def false_positive_rate(self) -> dict:
+        '''Returns estimated false-positive rate of Bloom filter and rate observed over lookups of unseen articles'''
+        with self._lock:
+            _negatives = self.lookups - (self.bloom_positives - self.false_positives)
+            return {
+                'estimated': self._bloom.estimated_fp_rate(),
+                'observed': self.false_positives / _negatives if _negatives > 0 else 0.0,
+                'lookups': self.lookups,
+                'false_positives': self.false_positives,
+                'size': self._bloom.count
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,6 @@
-import pymongo
-import spacy
+import threading
 from dotenv import load_dotenv
 import os
-from google.cloud import bigquery
-from google.oauth2.service_account import Credentials
 
 load_dotenv()
 
@@ -81,13 +78,57 @@ ICON_CODE = {
     '50d': 'MIST'
 }
 
-TEXT = pymongo.TEXT
+# Value of `pymongo.TEXT`, kept literal so that importing constants does not load MongoDB driver
+TEXT = 'text'
 
-SPACY_DEFAULT_MODEL = 'en_core_web_md'
-SPACY_NLP = spacy.load(SPACY_DEFAULT_MODEL)
+SPACY_DEFAULT_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_md')
+SPACY_EXCLUDE = [name.strip() for name in os.getenv('SPACY_EXCLUDE', '').split(',') if name.strip() != '']
+NLP_PROFILES = {
+    'full': SPACY_EXCLUDE,
+    'sentences': ['tagger', 'attribute_ruler', 'lemmatizer', 'ner'],
+    'sentencizer': None
+}
+
+_NLP_MODELS = {}
+_NLP_LOCK = threading.Lock()
+
+def get_nlp(profile: str = 'full', model_name: str | None = None, exclude: list[str] | None = None):
+    '''
+    Loads spaCy pipeline on first use and caches it per model and profile.
+    Profiles given include `full` (model with components excluded by `SPACY_EXCLUDE`), `sentences` (model with only the components needed for
+    sentence boundaries, giving the same counts as `full`) and `sentencizer` (lightweight blank pipeline with rule-based sentencizer).
+    
+    :params:
+    profile: str - name of pipeline profile from `NLP_PROFILES`
+    model_name: str - optional, spaCy model to load; defaults to `SPACY_MODEL` environment variable or `en_core_web_md`
+    exclude: list of str - optional, pipeline components to exclude, overriding those of the profile
+    '''
+    if profile not in NLP_PROFILES:
+        raise Exception(f'NLP profile must be one of {list(NLP_PROFILES)}')
+    _model_name = model_name if model_name is not None else SPACY_DEFAULT_MODEL
+    _exclude = exclude if exclude is not None else NLP_PROFILES[profile]
+    _key = (_model_name, profile, tuple(_exclude or []))
+    with _NLP_LOCK:
+        if _key not in _NLP_MODELS:
+            import spacy
+            if profile == 'sentencizer':
+                _nlp = spacy.blank(_model_name.split('_')[0])
+                _nlp.add_pipe('sentencizer')
+            else:
+                _nlp = spacy.load(_model_name, exclude=_exclude)
+            _NLP_MODELS[_key] = _nlp
+        return _NLP_MODELS[_key]
+
+def __getattr__(name: str):
+    # `SPACY_NLP` kept for backward compatibility, loading default model only when first accessed
+    if name == 'SPACY_NLP':
+        return get_nlp()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 TRANSLATOR = str.maketrans({chr(10): '', chr(9): ''})
 
+CACHE_DIR = os.getenv('MULTIEXTRACTOR_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'multiextractor'))
+
 class SciDailyConstants:
     SCI_SITE_NAME = 'Science Daily'
     SCI_DOMAIN_NAME = 'https://www.sciencedaily.com'
@@ -95,6 +136,21 @@ class SciDailyConstants:
     SCI_HEADERS = {'User-Agent': 'Chrome/116.0.5845.110  Safari/18615.2.9.11.10'}
     
 
+RSS_FEEDS = [
+    {
+        'source': 'cnbc',
+        'url': 'https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=19854910',
+        'body_attrs': {'class': 'ArticleBody-articleBody'},
+        'list_attrs': {'class': 'group'}
+    },
+    {
+        'source': 'trade_econ',
+        'url': 'https://tradingeconomics.com/rss/news.aspx?i=bank+lending+rate',
+        'body_attrs': None,
+        'list_attrs': None
+    }
+]
+
 class DBConstLoader:
     _NEON_CONN_STR = 'postgresql+psycopg2://{DB_USER}:{DB_KEY}@{COMPUTE_NAME}.{COMPUTE_LOCATION}.aws.neon.tech/{DB_NAME}'
     _MONGO_CONN_STR = 'mongodb+srv://{DB_USER}:{DB_KEY}@{DB_NAME}.l0wmrp9.mongodb.net/?retryWrites=true&w=majority'
@@ -191,6 +247,8 @@ class CloudDBConnect:
                 return Exception('No paramaters found for connection.')
             
     def _build_conn(self):
+        from google.cloud import bigquery
+        from google.oauth2.service_account import Credentials
         if self.KEY_PATH is not None:
             _credentials = Credentials.from_service_account_file(self.KEY_PATH, scopes=["https://www.googleapis.com/auth/cloud-platform"])
             _client = bigquery.Client(project=_credentials.project_id, credentials=_credentials)
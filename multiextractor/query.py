@@ -1,96 +1,325 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Iterator
 import pandas as pd
-import polars as pl
 from datetime import datetime
+import os
 import io
 import json
-import polars as pl
-from google.cloud import bigquery
-from multiextractor.apis.db import neondb_connection, pg_connection, redis_connection
+import time
+import itertools
+from multiextractor.apis.db import pg_pooled_connection, redis_connection
 from multiextractor.constants import DBConstLoader, CloudDBConnect
+from multiextractor.schema import SchemaRegistry, get_schema_registry
 
+if TYPE_CHECKING:
+    import polars as pl
+    from google.cloud import bigquery
 
-def sql_insert_articles(df: pd.DataFrame, constraint_col: str | None, conn_params: DBConstLoader | None = None):
+
+DEFAULT_COPY_CHUNK_SIZE = 10000
+COMMIT_MODES = ('transaction', 'chunk', 'savepoint')
+COPY_NULL = '\\N'
+STAGE_ORDER_COL = '_stage_ord'
+
+DEFAULT_REDIS_CHUNK_SIZE = 1000
+DEFAULT_REDIS_SERIALIZER = 'orjson'
+REDIS_SERIALIZERS = ('orjson', 'msgpack', 'json')
+REDIS_STORAGE_MODES = ('string', 'hash')
+
+def _copy_chunk(cur, chunk: pd.DataFrame, staging_table: str, sql_col_str: str):
+    '''Streams chunk of rows into staging table through `COPY ... FROM STDIN` as CSV'''
+    _buffer = io.StringIO()
+    chunk.to_csv(_buffer, index=False, header=False, na_rep=COPY_NULL)
+    _buffer.seek(0)
+    cur.copy_expert(f"COPY {staging_table} {sql_col_str} FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", _buffer)
+
+def _iter_chunks(data: pd.DataFrame | Iterable[pd.DataFrame], chunk_size: int) -> Iterator[pd.DataFrame]:
+    '''Yields fixed-size row slices of frame, or of each frame of an iterator, without materializing rows'''
+    for frame in ([data] if isinstance(data, pd.DataFrame) else data):
+        for start in range(0, frame.shape[0], chunk_size):
+            yield frame.iloc[start:start + chunk_size]
+
+def _conflict_action(cols: tuple[str], constraint_col: str) -> str:
+    update_query_template = ', '.join(f'"{col}" = EXCLUDED."{col}"' for col in cols if col != constraint_col)
+    return f'UPDATE SET {update_query_template}' if update_query_template != '' else 'NOTHING'
+
+def _upsert_scripts(cols: tuple[str], table_name: str, constraint_col: str | None) -> tuple[str, str, str]:
     '''
-    Creates and executes SQL script for article insertion
-    
-    :params:
-    df: DataFrame object - table containing data to be inserted
-    constraint_col: str - column name indicating key column upon detecting duplicattes
+    Builds staging, insert and column list scripts of given columns; insert reports per row whether it was new (`xmax = 0`) or updated.
+    Staging table numbers rows in copy order, so that of rows sharing a key the last one is upserted.
     '''
-    # conn = pg_connection(conn_params)
-    conn = neondb_connection()
-    cur = conn.cursor()
-    
-    sql_col_str = ''.join(['("', '","'.join(df.columns), '")'])
-    sql_val_str = ''.join(['(', ','.join(['%s'] * df.shape[1]), ')'])
-    args_str = ','.join(cur.mogrify(sql_val_str, x).decode('utf-8') for x in df.values)
-    
+    sql_col_str = ''.join(['("', '","'.join(cols), '")'])
+    sql_select_str = ', '.join(f'"{col}"' for col in cols)
+    staging_table = f'"_stage_{table_name}"'
+
     if constraint_col is None:
-        insert_script = f'INSERT INTO articles {sql_col_str} VALUES {args_str}'
+        insert_script = f'INSERT INTO "{table_name}" {sql_col_str} SELECT {sql_select_str} FROM {staging_table} RETURNING (xmax = 0)'
     else:
-        sql_col_ups_str = ''.join(['(EXCLUDED."', '", EXCLUDED."'.join(df.columns), '")'])
-        update_query_template = '{} = {}'.format(sql_col_str, sql_col_ups_str)
         insert_script = f'''
-            INSERT INTO articles {sql_col_str}
-            VALUES {args_str}
+            INSERT INTO "{table_name}" {sql_col_str}
+            SELECT DISTINCT ON ("{constraint_col}") {sql_select_str} FROM {staging_table}
+            ORDER BY "{constraint_col}", "{STAGE_ORDER_COL}" DESC
             ON CONFLICT ("{constraint_col}") DO
-            UPDATE SET {update_query_template}
+            {_conflict_action(cols, constraint_col)}
+            RETURNING (xmax = 0)
         '''
-    # print(insert_script)
+    staging_script = f'CREATE TEMP TABLE IF NOT EXISTS {staging_table} (LIKE "{table_name}" INCLUDING DEFAULTS, "{STAGE_ORDER_COL}" BIGSERIAL) ON COMMIT DROP'
+    return staging_script, insert_script, sql_col_str
+
+def _load_chunk_values(cur, chunk: pd.DataFrame, table_name: str, constraint_col: str | None) -> tuple[int, int]:
+    '''
+    Upserts chunk with one multi-row `INSERT ... VALUES ... ON CONFLICT`, for backends without `ON COMMIT DROP` temporary tables or `xmax`
+    (CockroachDB).  Rows sharing a key are collapsed to the last one, and rows updated are counted from keys present before upsert.
+    Returns numbers of rows inserted and updated.
+    '''
+    from psycopg2.extras import execute_values
+    if constraint_col is not None:
+        chunk = chunk.drop_duplicates(constraint_col, keep='last')
+    cols = tuple(chunk.columns)
+    sql_col_str = ''.join(['("', '","'.join(cols), '")'])
+    insert_script = f'INSERT INTO "{table_name}" {sql_col_str} VALUES %s'
+    _existing = 0
+    if constraint_col is not None:
+        insert_script += f' ON CONFLICT ("{constraint_col}") DO {_conflict_action(cols, constraint_col)}'
+        cur.execute(f'SELECT count(*) FROM "{table_name}" WHERE "{constraint_col}" = ANY(%s)', (chunk[constraint_col].tolist(),))
+        _existing = cur.fetchone()[0]
+    _rows = list(chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None))
+    execute_values(cur, insert_script, _rows, page_size=max(len(_rows), 1))
+    _updated = _existing if (constraint_col is not None) and (len(cols) > 1) else 0
+    return len(_rows) - _existing, _updated
+
+def _load_chunk(cur, chunk: pd.DataFrame, table_name: str, constraint_col: str | None, backend: str = 'postgres') -> tuple[int, int]:
+    '''Copies chunk into staging table and upserts it into target table, returning numbers of rows inserted and updated'''
+    if backend == 'cockroach':
+        return _load_chunk_values(cur, chunk, table_name, constraint_col)
+    staging_script, insert_script, sql_col_str = _upsert_scripts(tuple(chunk.columns), table_name, constraint_col)
+    staging_table = f'"_stage_{table_name}"'
+    cur.execute(staging_script)
+    _copy_chunk(cur, chunk, staging_table, sql_col_str)
+    cur.execute(insert_script)
+    _inserted_flags = [flag for (flag,) in cur.fetchall()]
+    cur.execute(f'TRUNCATE {staging_table}')
+    return sum(_inserted_flags), len(_inserted_flags) - sum(_inserted_flags)
+
+def _reject_rows(rows: pd.DataFrame, error: Exception, reject_path: str | None):
+    if reject_path is not None:
+        rows.assign(error=str(error).strip()).to_csv(reject_path, mode='a', index=False, header=not os.path.exists(reject_path))
+
+def _load_chunk_guarded(cur, chunk: pd.DataFrame, table_name: str, constraint_col: str | None, reject_path: str | None, backend: str = 'postgres') -> tuple[int, int, list]:
+    '''
+    Loads chunk under savepoint.  If chunk fails, it is rolled back to savepoint, split in half and each half retried the same way, so that
+    only failing rows are rejected while healthy rows are still loaded in bulk.  Returns numbers of rows inserted and updated, and index labels
+    of rejected rows.
+    '''
+    cur.execute('SAVEPOINT load_chunk')
     try:
-        cur.execute(insert_script)
-        conn.commit()
-        conn.close()
-        print('All articles inserted')
+        _inserted, _updated = _load_chunk(cur, chunk, table_name, constraint_col, backend)
+        cur.execute('RELEASE SAVEPOINT load_chunk')
+        return _inserted, _updated, []
     except Exception as e:
-        print(e)
-        print('Error encountered in article insertion process')
+        cur.execute('ROLLBACK TO SAVEPOINT load_chunk')
+        if chunk.shape[0] == 1:
+            _reject_rows(chunk, e, reject_path)
+            return 0, 0, chunk.index.tolist()
+    _mid = chunk.shape[0] // 2
+    _inserted, _updated, _rejected = 0, 0, []
+    for half in (chunk.iloc[:_mid], chunk.iloc[_mid:]):
+        _half_inserted, _half_updated, _half_rejected = _load_chunk_guarded(cur, half, table_name, constraint_col, reject_path, backend)
+        _inserted += _half_inserted
+        _updated += _half_updated
+        _rejected += _half_rejected
+    return _inserted, _updated, _rejected
 
-def sql_create_table(df: pd.DataFrame, table_name: str = 'articles', unique_col: str | None = None, conn_params: DBConstLoader | None = None):
+def sql_insert_articles(
+    df: pd.DataFrame | Iterable[pd.DataFrame], 
+    constraint_col: str | None = None, 
+    conn_params: DBConstLoader | None = None, 
+    table_name: str = 'articles', 
+    chunk_size: int = DEFAULT_COPY_CHUNK_SIZE, 
+    commit_mode: str = 'transaction',
+    reject_path: str | None = None
+) -> dict:
     '''
-    Creates and executes SQL script for article table creation
+    Bulk loads articles by streaming fixed-size chunks of rows with `COPY ... FROM STDIN` into temporary staging table, then upserting them into
+    target table with one set-based `INSERT ... ON CONFLICT DO UPDATE` per chunk.  Rows sharing a key within a chunk are collapsed to one before
+    upsert.  Memory held is bounded by chunk size, so frames may also be given as an iterator, e.g. a chunked `pd.read_csv`.  On CockroachDB,
+    which lacks `ON COMMIT DROP` temporary tables and `xmax`, each chunk is upserted with a multi-row `INSERT ... VALUES` instead.
+
+    In `chunk` and `savepoint` modes a failing chunk is bisected and its halves retried, and only rows still failing are rejected and appended to the reject
+    file together with their error.  Returns load report with numbers of rows inserted, updated and rejected, chunks loaded, elapsed seconds,
+    error message if load failed, and index labels of rows committed to target table (`loaded_index`), so that callers can act on loaded rows only.
+    
+    :params:
+    df: DataFrame object or iterable of DataFrame objects - table containing data to be inserted
+    constraint_col: str - column name indicating key column upon detecting duplicattes; if None, rows are inserted without upsert
+    conn_params: DBConstLoader object - preset connection parameters based on data source loading; defaults to Neon database.  Connections are
+        checked out from process-wide pool of these parameters
+    table_name: str - name of target table
+    chunk_size: int - number of rows copied per chunk
+    commit_mode: str - `transaction` to load all chunks in a single all-or-nothing transaction, `chunk` to commit after every chunk, or
+        `savepoint` to load all chunks in a single transaction with each chunk under its own savepoint
+    reject_path: str - optional, CSV file to which rejected rows are appended
+    '''
+    if commit_mode not in COMMIT_MODES:
+        raise ValueError(f'Unknown commit mode {commit_mode}, expected one of {COMMIT_MODES}')
+    _report = {'inserted': 0, 'updated': 0, 'rejected': 0, 'chunks': 0, 'elapsed': 0.0, 'error': None, 'loaded_index': []}
+    _start = time.perf_counter()
+    _pending_index = []
+
+    with pg_pooled_connection(conn_params) as conn:
+        try:
+            _backend = get_schema_registry().backend(conn)
+            with conn.cursor() as cur:
+                for chunk in _iter_chunks(df, chunk_size):
+                    if commit_mode == 'transaction':
+                        _inserted, _updated = _load_chunk(cur, chunk, table_name, constraint_col, _backend)
+                        _rejected = []
+                    else:
+                        _inserted, _updated, _rejected = _load_chunk_guarded(cur, chunk, table_name, constraint_col, reject_path, _backend)
+                    _pending_index += chunk.index.difference(_rejected, sort=False).tolist() if len(_rejected) > 0 else chunk.index.tolist()
+                    if commit_mode == 'chunk':
+                        conn.commit()
+                        _report['loaded_index'] += _pending_index
+                        _pending_index = []
+                    _report['inserted'] += _inserted
+                    _report['updated'] += _updated
+                    _report['rejected'] += len(_rejected)
+                    _report['chunks'] += 1
+            conn.commit()
+            _report['loaded_index'] += _pending_index
+            print(f'Articles loaded: {_report["inserted"]} inserted, {_report["updated"]} updated, {_report["rejected"]} rejected')
+        except Exception as e:
+            conn.rollback()
+            if commit_mode != 'chunk':
+                _report.update({'inserted': 0, 'updated': 0, 'rejected': 0})
+            _report['error'] = str(e)
+            print(e)
+            print('Error encountered in article insertion process')
+    _report['elapsed'] = time.perf_counter() - _start
+    return _report
+
+def sql_create_table(
+    df: pd.DataFrame, 
+    table_name: str = 'articles', 
+    unique_col: str | None = None, 
+    conn_params: DBConstLoader | None = None, 
+    registry: SchemaRegistry | None = None
+):
+    '''
+    Creates or extends table to hold given data.  Target table schema is introspected once per process and DDL is only sent when data differs
+    from it: table is created if missing, new columns are added with `ALTER TABLE ADD COLUMN`, and a unique index is put on `unique_col`.
     
     :params:
     df: DataFrame object - data table to extract table schema for SQL table creation query
     table_name: str - name of table to be created in Postgres database
     unique_col: str - name of column to set as unique index in created table
     conn_params: DBConstLoader object - preset connection parameters based on data source loading
+    registry: SchemaRegistry object - optional, registry of known table schemas; defaults to process-wide registry
     '''
-    table_script = pd.io.sql.get_schema(df, table_name)
-    idx = table_script.index('TABLE')
-    table_script = table_script[:idx + len('TABLE')] + ' IF NOT EXISTS' + table_script[idx + len('TABLE'):]
-
-    if unique_col is not None:
-        # to_replace_str = '"' + unique_col + '"'
-        to_replace_str = ','
-        idx = table_script.index(to_replace_str)
-        # len_replace_str = len(to_replace_str)
-        # table_script = table_script[: (idx + len_replace_str)] + ' UNIQUE' + table_script[(idx + len_replace_str):]
-        table_script = table_script[:idx] + ' UNIQUE' + table_script[idx:]
-
-    # print(table_script)
-    # with pg_connection(conn_params) as conn:
-    with neondb_connection() as conn:
+    _registry = registry if registry is not None else get_schema_registry()
+    with pg_pooled_connection(conn_params) as conn:
         try:
-            cur = conn.cursor()
-            cur.execute(table_script)
+            _registry.ensure_table(conn, df, table_name, unique_col)
         except Exception as e:
+            conn.rollback()
             print(e)
             print('Error encountered in table creation process')
             
-def key_val_insert(records: dict[dict[str]], conn_params: DBConstLoader | None = None) -> None:
+def _redis_serializer(name: str):
+    '''Returns function serializing record into bytes; raises `ImportError` if the serializer's package is not installed'''
+    match name:
+        case 'orjson':
+            import orjson
+            return lambda rec: orjson.dumps(rec, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        case 'msgpack':
+            import msgpack
+            return lambda rec: msgpack.packb(rec, default=str)
+        case 'json':
+            return lambda rec: json.dumps(rec, default=str).encode('utf-8')
+        case _:
+            raise ValueError(f'Unknown serializer {name}, expected one of {REDIS_SERIALIZERS}')
+
+def _hash_mapping(rec: dict, serialize) -> dict:
+    '''Flattens record into Redis hash fields; scalars are stored as is and nested values serialized'''
+    _mapping = {}
+    for field, value in rec.items():
+        if value is None:
+            _mapping[field] = ''
+        elif isinstance(value, bool):
+            _mapping[field] = int(value)
+        elif isinstance(value, (str, bytes, int, float)):
+            _mapping[field] = value
+        elif hasattr(value, 'isoformat'):
+            _mapping[field] = value.isoformat()
+        else:
+            _mapping[field] = serialize(value)
+    return _mapping
+
+def key_val_insert(
+    records: dict[dict[str]], 
+    conn_params: DBConstLoader | None = None, 
+    storage: str = 'string', 
+    serializer: str = DEFAULT_REDIS_SERIALIZER, 
+    ttl: int | dict[str, int] | None = None, 
+    chunk_size: int = DEFAULT_REDIS_CHUNK_SIZE
+) -> dict:
     '''
-    Creates and executes reocrds insert operation on Redis database
+    Writes records to Redis through non-transactional pipelines flushed every `chunk_size` records, either as one serialized string per key
+    or as a hash of record fields.  Failed commands do not stop remaining writes; in hash mode, records without fields are counted as failed.
+    Returns write report with numbers of records written and failed, chunks flushed, bytes of serialized string values, elapsed seconds and
+    keys of failed records (`failed_keys`).
     
     :params:
-    records: dict of dicts - data records to be inserted to database
+    records: dict of dicts - data records to be inserted to database, by key
     conn_params: DBConstLoader object - preset connection parameters based on data source loading
+    storage: str - `string` to store each record as serialized value, or `hash` to store its fields as Redis hash
+    serializer: str - `orjson`, `msgpack` or `json`, used for string values and nested hash fields
+    ttl: int or dict - optional, expiry in seconds of all keys, or of each key by key
+    chunk_size: int - number of records per pipeline flush
     '''
+    if storage not in REDIS_STORAGE_MODES:
+        raise ValueError(f'Unknown storage {storage}, expected one of {REDIS_STORAGE_MODES}')
+    _serialize = _redis_serializer(serializer)
+    _report = {'written': 0, 'failed': 0, 'chunks': 0, 'bytes': 0, 'elapsed': 0.0, 'failed_keys': []}
+    _start = time.perf_counter()
+
     rd = redis_connection(conn_params)
-    with rd.pipeline() as pipe:
-        for rec_id, rec in records.items():
-            pipe.set(rec_id, json.dumps(rec))
-    pipe.execute()
+    _items = iter(records.items())
+    with rd.pipeline(transaction=False) as pipe:
+        while True:
+            _chunk = list(itertools.islice(_items, chunk_size))
+            if len(_chunk) == 0:
+                break
+            _commands_per_rec = []
+            for rec_id, rec in _chunk:
+                _ttl = ttl.get(rec_id, None) if isinstance(ttl, dict) else ttl
+                if storage == 'string':
+                    _value = _serialize(rec)
+                    _report['bytes'] += len(_value)
+                    pipe.set(rec_id, _value, ex=_ttl)
+                    _commands_per_rec.append((rec_id, 1))
+                else:
+                    _mapping = _hash_mapping(rec, _serialize)
+                    if len(_mapping) == 0:
+                        # `HSET` with no fields is rejected client-side and would abort the whole chunk
+                        _report['failed'] += 1
+                        _report['failed_keys'].append(rec_id)
+                        continue
+                    pipe.hset(rec_id, mapping=_mapping)
+                    if _ttl is not None:
+                        pipe.expire(rec_id, _ttl)
+                    _commands_per_rec.append((rec_id, 1 if _ttl is None else 2))
+            _results = iter(pipe.execute(raise_on_error=False))
+            for rec_id, n in _commands_per_rec:
+                _res = list(itertools.islice(_results, n))
+                if any(isinstance(res, Exception) for res in _res):
+                    _report['failed'] += 1
+                    _report['failed_keys'].append(rec_id)
+                else:
+                    _report['written'] += 1
+            _report['chunks'] += 1
+    _report['elapsed'] = time.perf_counter() - _start
+    return _report
     
 def dt_to_isoformat(df: pd.DataFrame) -> pd.DataFrame:
     '''
@@ -273,16 +502,19 @@ class BQClimate:
         self._is_registered = True
         
     def _set_dataset(self, dataset_name: str):
+        from google.cloud import bigquery
         dataset_id = f'{self.client.project}.{dataset_name}'
         _dataset = bigquery.Dataset(dataset_id)
         self.dataset = self.client.create_dataset(_dataset, timeout=30, exists_ok=True)
         
     def _set_table(self, table_name: str):
+        from google.cloud import bigquery
         table_id = f'{self.client.project}.{self.dataset.dataset_id}.{table_name}'
         _table = bigquery.Table(table_id, schema=self.table_schema)
         self.table = self.client.create_table(_table, timeout=30, exists_ok=True)
     
     def load_table_to_gcp(self, data: pl.DataFrame, src_format='polars'):
+        from google.cloud import bigquery
         assert self._is_registered, 'BQ dataset and table are not selected for data processing.'
         match src_format:
             case 'polars':
@@ -309,6 +541,8 @@ class BQClimate:
         print(f'Data loaded to {self.table.project}.{self.table.dataset_id}.{self.table.table_id}!')
     
     def create_bq_schema(self, schema: dict, override_table_schema: str = None, override_col_list: list = None):
+        import polars as pl
+        from google.cloud import bigquery
         _bq_schema_list = []
         for col_name, data_type in schema.items():
             if isinstance(data_type, (pl.Struct, pl.List)):
@@ -351,6 +585,7 @@ class BQClimate:
     
     @staticmethod
     def _get_bq_type(col_name: str, data_type, main_col_name: str, override_table_schema: str, override_col_list: list):
+        import polars as pl
         bq_mode = 'NULLABLE'
         bq_type = None
         match data_type:
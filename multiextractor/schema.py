@@ -0,0 +1,253 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import threading
+import pandas as pd
+
+if TYPE_CHECKING:
+    import psycopg2
+    import pymongo
+
+_COLUMNS_QUERY = '''
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = %s
+    ORDER BY ordinal_position
+'''
+_UNIQUE_QUERY = '''
+    SELECT tc.constraint_name, kcu.column_name
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.key_column_usage kcu
+        ON tc.constraint_name = kcu.constraint_name AND tc.table_schema = kcu.table_schema AND tc.table_name = kcu.table_name
+    WHERE tc.table_schema = current_schema() AND tc.table_name = %s AND tc.constraint_type IN ('UNIQUE', 'PRIMARY KEY')
+'''
+_UNIQUE_INDEX_QUERY = '''
+    SELECT ix.relname, a.attname
+    FROM pg_index i
+    JOIN pg_class ix ON ix.oid = i.indexrelid
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = to_regclass(%s) AND i.indisunique
+'''
+
+def sql_column_type(col: pd.Series) -> str:
+    '''Maps column dtype to SQL type, matching types given by `pd.io.sql.get_schema` for tables created before'''
+    if pd.api.types.is_bool_dtype(col) or pd.api.types.is_integer_dtype(col):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(col):
+        return 'REAL'
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return 'TIMESTAMP'
+    match pd.api.types.infer_dtype(col, skipna=True):
+        case 'date':
+            return 'DATE'
+        case 'time':
+            return 'TIME'
+        case 'datetime':
+            return 'TIMESTAMP'
+        case _:
+            return 'TEXT'
+
+class SchemaRegistry:
+    '''
+    Process-wide record of target table schemas.  Each table is introspected from the database catalog once, after which loads compare the
+    frame's columns against the recorded schema and send DDL only when they differ: `CREATE TABLE` for missing tables, `ALTER TABLE ADD COLUMN`
+    for new columns and a unique index when the upsert key has none.  Tables are keyed by database host, port and name.  The server backend of
+    each database (`postgres` or `cockroach`) is also recorded, so that loaders can avoid features CockroachDB lacks.
+    '''
+    def __init__(self):
+        self._tables = {}
+        self._backends = {}
+        self._lock = threading.Lock()
+        self.introspections = 0
+        self.ddl_statements = 0
+
+    @staticmethod
+    def _key(conn: psycopg2.extensions.connection, table_name: str) -> tuple:
+        return (conn.info.host, conn.info.port, conn.info.dbname, table_name)
+
+    def backend(self, conn: psycopg2.extensions.connection) -> str:
+        '''Returns `cockroach` if database is served by CockroachDB, otherwise `postgres`, querying server version once per database'''
+        _key = (conn.info.host, conn.info.port, conn.info.dbname)
+        with self._lock:
+            _backend = self._backends.get(_key, None)
+        if _backend is None:
+            with conn.cursor() as cur:
+                cur.execute('SELECT version()')
+                _backend = 'cockroach' if 'cockroachdb' in cur.fetchone()[0].lower() else 'postgres'
+            with self._lock:
+                self._backends[_key] = _backend
+        return _backend
+
+    def introspect(self, conn: psycopg2.extensions.connection, table_name: str) -> dict:
+        '''
+        Reads columns and single-column unique constraints of table from catalog and records them.  Table not found has no columns.
+
+        :params:
+        conn: psycopg2 connection object - connection to database holding table
+        table_name: str - name of table
+        '''
+        with conn.cursor() as cur:
+            cur.execute(_COLUMNS_QUERY, (table_name,))
+            _columns = dict(cur.fetchall())
+            _unique_cols = {}
+            if len(_columns) > 0:
+                cur.execute(_UNIQUE_QUERY, (table_name,))
+                _rows = cur.fetchall()
+                cur.execute(_UNIQUE_INDEX_QUERY, (f'"{table_name}"',))
+                for name, col in _rows + cur.fetchall():
+                    _unique_cols.setdefault(name, set()).add(col)
+        _schema = {'columns': _columns, 'unique': {cols.pop() for cols in _unique_cols.values() if len(cols) == 1}}
+        with self._lock:
+            self._tables[self._key(conn, table_name)] = _schema
+            self.introspections += 1
+        return _schema
+
+    def get(self, conn: psycopg2.extensions.connection, table_name: str) -> dict:
+        '''Returns recorded schema of table, introspecting it on first request'''
+        with self._lock:
+            _schema = self._tables.get(self._key(conn, table_name), None)
+        return _schema if _schema is not None else self.introspect(conn, table_name)
+
+    def invalidate(self, conn: psycopg2.extensions.connection | None = None, table_name: str | None = None):
+        '''Forgets recorded schema of table, or of all tables if none given, e.g. after tables are changed outside this process'''
+        with self._lock:
+            if (conn is None) or (table_name is None):
+                self._tables.clear()
+            else:
+                self._tables.pop(self._key(conn, table_name), None)
+
+    def plan(self, conn: psycopg2.extensions.connection, df: pd.DataFrame, table_name: str, unique_col: str | None = None) -> list[str]:
+        '''
+        Returns DDL statements needed for table to hold frame, empty if recorded schema already matches.
+
+        :params:
+        conn: psycopg2 connection object - connection to database holding table
+        df: DataFrame object - data table to be loaded
+        table_name: str - name of target table
+        unique_col: str - optional, name of column to be covered by unique index
+        '''
+        _schema = self.get(conn, table_name)
+        if len(_schema['columns']) == 0:
+            _col_defs = ', '.join(f'"{col}" {sql_column_type(df[col])}' + (' UNIQUE' if col == unique_col else '') for col in df.columns)
+            return [f'CREATE TABLE IF NOT EXISTS "{table_name}" ({_col_defs})']
+
+        _scripts = []
+        _new_cols = [col for col in df.columns if col not in _schema['columns']]
+        if len(_new_cols) > 0:
+            _scripts.append(f'ALTER TABLE "{table_name}" ' + ', '.join(f'ADD COLUMN IF NOT EXISTS "{col}" {sql_column_type(df[col])}' for col in _new_cols))
+        if (unique_col is not None) and (unique_col not in _schema['unique']):
+            _scripts.append(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_{unique_col}_key" ON "{table_name}" ("{unique_col}")')
+        return _scripts
+
+    def ensure_table(self, conn: psycopg2.extensions.connection, df: pd.DataFrame, table_name: str, unique_col: str | None = None) -> list[str]:
+        '''
+        Brings table in line with frame, sending DDL only when schema differs, and commits.  Returns DDL statements executed.
+
+        :params:
+        conn: psycopg2 connection object - connection to database holding table
+        df: DataFrame object - data table to be loaded
+        table_name: str - name of target table
+        unique_col: str - optional, name of column to be covered by unique index
+        '''
+        _scripts = self.plan(conn, df, table_name, unique_col)
+        if len(_scripts) == 0:
+            return _scripts
+        try:
+            with conn.cursor() as cur:
+                for script in _scripts:
+                    cur.execute(script)
+            conn.commit()
+        finally:
+            # recorded schema is re-read after any DDL, whether or not it succeeded
+            self.invalidate(conn, table_name)
+        with self._lock:
+            self.ddl_statements += len(_scripts)
+        return _scripts
+
+    def stats(self) -> dict:
+        '''Returns number of tables recorded, catalog introspections and DDL statements sent'''
+        with self._lock:
+            return {'tables': len(self._tables), 'introspections': self.introspections, 'ddl_statements': self.ddl_statements}
+
+_SCHEMA_REGISTRY = SchemaRegistry()
+
+def get_schema_registry() -> SchemaRegistry:
+    '''Returns process-wide schema registry'''
+    return _SCHEMA_REGISTRY
+
+class IndexRegistry:
+    '''
+    Process-wide record of MongoDB collection indexes.  Existing indexes of each collection are read with `list_indexes()` once, after which
+    indexes are only created when missing, so that repeated writes do not send `create_index` to the server.  Collections are keyed by
+    database and collection name.
+    '''
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self.syncs = 0
+        self.created = 0
+
+    @staticmethod
+    def _normalize(keys: list[tuple]) -> tuple:
+        return tuple((field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in keys)
+
+    def indexes(self, collection: pymongo.collection.Collection) -> dict[tuple, dict]:
+        '''Returns known indexes of collection by key pattern, reading them from server on first request'''
+        with self._lock:
+            _known = self._indexes.get(collection.full_name, None)
+        if _known is None:
+            _known = {self._normalize(spec['key'].items()): {'name': spec['name'], 'unique': spec.get('unique', False)} for spec in collection.list_indexes()}
+            with self._lock:
+                self._indexes[collection.full_name] = _known
+                self.syncs += 1
+        return _known
+
+    def ensure_index(self, collection: pymongo.collection.Collection, keys: list[tuple], unique: bool = False) -> str:
+        '''
+        Creates index on collection unless an index of same key pattern is known, and returns its name.
+
+        :params:
+        collection: MongoDB collection instance - object referencing to collection
+        keys: list of tuples containing str and integer/enum value - index key pattern
+        unique: bool - if True, index enforces unique keys
+        '''
+        _keys = self._normalize(keys)
+        _known = self.indexes(collection)
+        if _keys in _known:
+            return _known[_keys]['name']
+        _name = collection.create_index(list(_keys), unique=unique)
+        with self._lock:
+            _known[_keys] = {'name': _name, 'unique': unique}
+            self.created += 1
+        return _name
+
+    def supports_sort(self, collection: pymongo.collection.Collection, sort_cols: list[tuple]) -> bool:
+        '''Checks if a known index can back given sort, i.e. its key pattern starts with sort fields in same or fully reversed directions'''
+        _sort = self._normalize(sort_cols)
+        _reversed = tuple((field, -direction) for field, direction in _sort)
+        return any(keys[:len(_sort)] in (_sort, _reversed) for keys in self.indexes(collection))
+
+    def ensure_sort_index(self, collection: pymongo.collection.Collection, sort_cols: list[tuple]) -> bool:
+        '''Creates index backing given sort unless one is known; returns True if index was created'''
+        if self.supports_sort(collection, sort_cols):
+            return False
+        self.ensure_index(collection, sort_cols)
+        return True
+
+    def invalidate(self, collection: pymongo.collection.Collection | None = None):
+        '''Forgets known indexes of collection, or of all collections if none given'''
+        with self._lock:
+            if collection is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(collection.full_name, None)
+
+    def stats(self) -> dict:
+        '''Returns number of collections known, `list_indexes()` syncs and indexes created'''
+        with self._lock:
+            return {'collections': len(self._indexes), 'syncs': self.syncs, 'created': self.created}
+
+_INDEX_REGISTRY = IndexRegistry()
+
+def get_index_registry() -> IndexRegistry:
+    '''Returns process-wide MongoDB index registry'''
+    return _INDEX_REGISTRY
@@ -1,24 +1,53 @@
-from .text import extract_tokens, extract_sentences
-from .general import rename_columns, split_source, process_datetime, process_sentence_count, process_token_count
-from .alphavan import (
-    extract_price_data, 
-    extract_perc_data, 
-    extract_main_article,
-    generate_sentiment_data_dict, 
-    extract_ticker_sentiment_topic, 
-    insert_to_collection, 
-    check_doc_presence, 
-    extract_top_n, 
-    subset_data
-)
-from .soup_funcs import (
-    locate_elements,
-    process_text,
-    extract_date,
-    process_date
-)
-from .climate import (
-    reformat_iqair,
-    reformat_forecasted_ow,
-    reformat_current_ow
-)
\ No newline at end of file
+import importlib
+
+# Public names of submodules, imported only when first accessed
+_LAZY_SUBMODULES = {
+    '.text': ['extract_tokens', 'extract_sentences', 'count_sentences', 'count_tokens', 'profile_texts', 'profile_texts_parallel', 'nlp_fingerprint'],
+    '.general': ['rename_columns', 'split_source', 'process_datetime', 'process_sentence_count', 'process_token_count', 'process_text_stats'],
+    '.alphavan': [
+        'extract_price_data', 
+        'extract_perc_data', 
+        'extract_main_article',
+        'generate_sentiment_data_dict', 
+        'extract_ticker_sentiment_topic', 
+        'insert_to_collection', 
+        'bulk_upsert', 
+        'bulk_load_news', 
+        'check_doc_presence', 
+        'extract_top_n', 
+        'subset_data',
+        'WatermarkStore',
+        'load_with_watermark'
+    ],
+    '.soup_funcs': [
+        'build_soup',
+        'build_strainer',
+        'build_attrs_strainer',
+        'locate_elements',
+        'process_text',
+        'extract_date',
+        'process_date',
+        'parse_content',
+        'parse_rss_body',
+        'parse_scidaily_story'
+    ],
+    '.feeds': ['parse_feed', 'iterparse_feed_entries', 'FeedPullParser'],
+    '.climate': [
+        'reformat_iqair',
+        'reformat_forecasted_ow',
+        'reformat_current_ow'
+    ]
+}
+_LAZY_ATTRS = {name: module for module, names in _LAZY_SUBMODULES.items() for name in names}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        _value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = _value
+        return _value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
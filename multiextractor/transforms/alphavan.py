@@ -2,6 +2,7 @@ import pandas as pd
 import re
 import copy
 import numpy as np
+from multiextractor.schema import get_index_registry
 
 def extract_price_data(data: dict) -> pd.DataFrame:
     '''
@@ -100,13 +101,14 @@ def insert_to_collection(db: object, collection_name: str, item: list, set_index
     db: MongoDB database instance - object referencing to database
     collection_name: MongoDB collection instance - object referencing to collection
     item: list of dicts - contain article item to be inserted to collection
-    set_index: list of tuples containing str and integer/enum value - if required, index parameters for index creation on collection to allow easier sorting and search
+    set_index: list of tuples containing str and integer/enum value - if required, index parameters for index creation on collection to allow easier sorting and search;
+        created only once per process if missing
     **kwargs: dict - contain other parameters for insertion method
     '''
     _collection = db[collection_name]
     if set_index is not None:
         unique = kwargs.get('unique', False)
-        _collection.create_index(set_index, unique=unique)
+        get_index_registry().ensure_index(_collection, set_index, unique=unique)
     
     if isinstance(item, list):
         if len(item) > 1:
@@ -117,6 +119,83 @@ def insert_to_collection(db: object, collection_name: str, item: list, set_index
     else:
         _collection.insert_one(item[0])
         
+def _write_result(result) -> dict:
+    return {
+        'inserted': result.inserted_count,
+        'upserted': result.upserted_count,
+        'matched': result.matched_count,
+        'modified': result.modified_count
+    }
+
+def bulk_upsert(db: object, collection_name: str, docs: list[dict], key_fields: list[str], set_index: list[tuple] | None = None, session=None, **kwargs) -> dict:
+    '''
+    Writes documents into MongoDB collection in one unordered `bulk_write` of upserts keyed by given fields.  Documents are only inserted
+    if no document with same key exists (`$setOnInsert`), so repeated loads leave stored documents untouched.  Returns write results,
+    including number of write errors if any operation failed.
+    
+    :params:
+    db: MongoDB database instance - object referencing to database
+    collection_name: str - name of collection
+    docs: list of dicts - documents to be written
+    key_fields: list of str - fields identifying document
+    set_index: list of tuples containing str and integer/enum value - if required, index parameters for index creation on collection;
+        created only once per process if missing
+    session: MongoDB client session - optional, session of transaction to write within
+    **kwargs: dict - contain other parameters for index creation, e.g. `unique`
+    '''
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+    _collection = db[collection_name]
+    if set_index is not None:
+        get_index_registry().ensure_index(_collection, set_index, unique=kwargs.get('unique', False))
+    if len(docs) == 0:
+        return {'inserted': 0, 'upserted': 0, 'matched': 0, 'modified': 0, 'errors': 0}
+
+    _ops = [UpdateOne({field: doc[field] for field in key_fields}, {'$setOnInsert': doc}, upsert=True) for doc in docs]
+    try:
+        return {**_write_result(_collection.bulk_write(_ops, ordered=False, session=session)), 'errors': 0}
+    except BulkWriteError as e:
+        # within a transaction, write errors abort it and must reach the caller
+        if session is not None:
+            raise
+        _details = e.details
+        return {
+            'inserted': _details.get('nInserted', 0),
+            'upserted': _details.get('nUpserted', 0),
+            'matched': _details.get('nMatched', 0),
+            'modified': _details.get('nModified', 0),
+            'errors': len(_details.get('writeErrors', []))
+        }
+
+def bulk_load_news(db: object, article_base_list: list[pd.DataFrame], sentiments_list: list[pd.DataFrame], topics_list: list[pd.DataFrame]) -> dict[str, dict]:
+    '''
+    Loads news sentiment feed in a handful of round trips: stored titles of whole feed are looked up with one `$in` query, and main article,
+    topic and ticker sentiment documents of new articles are each written to their collection in one batched call.  Returns write results per collection.
+    
+    :params:
+    db: MongoDB database instance - object referencing to database
+    article_base_list: list of DataFrames - main article table of each article
+    sentiments_list: list of DataFrames - ticker sentiment table of each article
+    topics_list: list of DataFrames - topic table of each article
+    '''
+    _titles = [df['title'].values[0] for df in article_base_list]
+    _stored = {doc['title'] for doc in db['alphav_news_main'].find({'title': {'$in': _titles}}, {'title': 1, '_id': 0})}
+
+    _new_idx, _new_titles = [], set()
+    for i, title in enumerate(_titles):
+        if (title not in _stored) and (title not in _new_titles):
+            _new_idx.append(i)
+            _new_titles.add(title)
+
+    def _records(frames: list[pd.DataFrame]) -> list[dict]:
+        return [rec for i in _new_idx for rec in frames[i].to_dict(orient='records')]
+
+    return {
+        'alphav_news_main': bulk_upsert(db, 'alphav_news_main', _records(article_base_list), ['title', 'time_published'], set_index=[('title', 1), ('time_published', 1)], unique=True),
+        'alphav_news_topic': bulk_upsert(db, 'alphav_news_topic', _records(topics_list), ['title', 'time_published', 'topic'], set_index=[('title', 1), ('time_published', 1), ('topic', 1)], unique=True),
+        'alphav_news_comp_sent': bulk_upsert(db, 'alphav_news_comp_sent', _records(sentiments_list), ['title', 'time_published', 'ticker'], set_index=[('title', 1), ('time_published', 1), ('ticker', 1)], unique=True)
+    }
+        
 def check_doc_presence(db_name: object, collection_name: object, column: str, condition: dict) -> list[str]:
     '''
     Conducts document query on MongoDB collection to indicate and return (if any) presence of documents based on entered query.
@@ -132,7 +211,8 @@ def check_doc_presence(db_name: object, collection_name: object, column: str, co
 
 def extract_top_n(db_name: object, collection_name: object, column: str | list[str], n: int = 1) -> dict:
     '''
-    Extracts top `n` document results after sorting of document done provided specified columns and sort order.
+    Extracts top `n` document results after sorting of document done provided specified columns and sort order.  An index backing the sort
+    is created once per process if collection has none, so that query does not scan whole collection.
     
     :params:
     db_name: MongoDB database instance - object referencing to database
@@ -143,23 +223,130 @@ def extract_top_n(db_name: object, collection_name: object, column: str | list[s
         sort_cols = [(c, -1) for c in column]
     else:
         sort_cols = [(column, -1)]
+    get_index_registry().ensure_sort_index(db_name[collection_name], sort_cols)
     result = db_name[collection_name].find().sort(sort_cols).limit(n)
     return list(result)[0]
 
-def subset_data(df: pd.DataFrame, db_name: object, collection_name: object, column: str):
+WATERMARK_COLLECTION = 'alphav_watermarks'
+
+class WatermarkStore:
     '''
-    Creates a subset of original data by providing custom indices based on the exclusion of existing records in MongoDB collection.
-    Carried out by extracting latest documents stored in collection and excluding records already in the to-be inputted data.
+    Ingestion watermarks kept in a small MongoDB metadata collection: the last loaded date of each collection, and of each ticker (or other
+    grouping value) within it.  Lookups are single-document reads by key, so incremental loads cost the same whatever the collection size.
+    Watermarks only move forward (`$max`), so a late or repeated load never rewinds them.
+    
+    :params:
+    db: MongoDB database instance - object referencing to database
+    collection_name: str - name of metadata collection holding watermarks
+    '''
+    def __init__(self, db: object, collection_name: str = WATERMARK_COLLECTION):
+        self.db = db
+        self.collection_name = collection_name
+
+    @staticmethod
+    def make_key(collection_name: str, group: str | None = None) -> str:
+        return f'{collection_name}:{group}' if group is not None else collection_name
+
+    def get(self, collection_name: str, group: str | None = None):
+        '''Returns last loaded date of collection (and group), or None if nothing has been recorded'''
+        _doc = self.db[self.collection_name].find_one({'_id': self.make_key(collection_name, group)}, {'date': 1})
+        return _doc['date'] if _doc is not None else None
+
+    def advance(self, collection_name: str, value, group: str | None = None, session=None):
+        '''Moves watermark of collection (and group) forward to given date, optionally within session of a transaction'''
+        self.db[self.collection_name].update_one(
+            {'_id': self.make_key(collection_name, group)},
+            {'$max': {'date': value}, '$set': {'collection': collection_name, 'group': group}},
+            upsert=True,
+            session=session
+        )
+
+def _split_date_column(column: str | list[str]) -> tuple[str, list[str]]:
+    # first column is date compared against watermark; any further columns (e.g. ticker) group watermarks
+    _cols = column if isinstance(column, list) else [column]
+    return _cols[0], _cols[1:]
+
+def _frame_groups(df: pd.DataFrame, group_cols: list[str]):
+    if len(group_cols) == 0:
+        yield None, df
+    else:
+        for key, group in df.groupby(group_cols, sort=False):
+            yield '|'.join(map(str, key if isinstance(key, tuple) else (key,))), group
+
+def subset_data(df: pd.DataFrame, db_name: object, collection_name: object, column: str | list[str], watermarks: WatermarkStore | None = None):
+    '''
+    Creates a subset of original data by excluding records not newer than the ingestion watermark of the collection.  Dates are compared per
+    group when further key columns are given (e.g. per ticker), so records are kept correctly even when latest stored date is absent from new data.
+    Collections without a recorded watermark are bootstrapped once from their latest stored document, and the bootstrapped watermark is saved
+    right away, so that later runs do not repeat the lookup even when no new records are returned.
     
     :params:
     df: dataframe object - main data (i.e. latest extracted data pulled from API)
     db_name: MongoDB database instance - object referencing to database
     collection_name: MongoDB collection instance - object referencing to collection
-    column: str or list of str - name of key column(s) to be searched under given collection and respective order provided (current setting is 'reverse' order) 
+    column: str or list of str - name of date column, optionally followed by grouping column(s) such as ticker
+    watermarks: WatermarkStore object - optional, store of ingestion watermarks; defaults to store in same database
     '''
-    top_values = extract_top_n(db_name, collection_name, column)
-    idx = df[df['date'] == top_values['date']].index
-    filtered_df = df.loc[:idx.values[0] - 1]
+    _store = watermarks if watermarks is not None else WatermarkStore(db_name)
+    _date_col, _group_cols = _split_date_column(column)
+    _parts = []
+    for group, frame in _frame_groups(df, _group_cols):
+        _mark = _store.get(collection_name, group)
+        if _mark is None:
+            _query = {col: frame[col].iloc[0] for col in _group_cols}
+            _latest = db_name[collection_name].find_one(_query, {_date_col: 1}, sort=[(_date_col, -1)])
+            _mark = _latest[_date_col] if _latest is not None else None
+            if _mark is not None:
+                _store.advance(collection_name, _mark, group)
+        _parts.append(frame if _mark is None else frame[frame[_date_col] > _mark])
+    filtered_df = pd.concat(_parts) if len(_parts) > 0 else df.iloc[0:0]
     if filtered_df.shape[0] == 0:
         return None
-    return filtered_df
\ No newline at end of file
+    return filtered_df
+
+def load_with_watermark(
+    db: object, 
+    collection_name: str, 
+    df: pd.DataFrame, 
+    column: str | list[str], 
+    set_index: list[tuple], 
+    watermarks: WatermarkStore | None = None, 
+    unique: bool = True
+) -> dict:
+    '''
+    Upserts records into collection and advances ingestion watermarks to latest loaded date of each group, within one transaction where the
+    deployment supports it so that data and watermark never diverge.  On standalone servers without transactions, watermarks are advanced
+    right after a successful write.  Returns write results.
+    
+    :params:
+    db: MongoDB database instance - object referencing to database
+    collection_name: str - name of collection
+    df: dataframe object - records to be loaded, e.g. as returned by `subset_data`
+    column: str or list of str - name of date column, optionally followed by grouping column(s) such as ticker
+    set_index: list of tuples containing str and integer/enum value - index of collection, whose fields also key upserts
+    watermarks: WatermarkStore object - optional, store of ingestion watermarks; defaults to store in same database
+    unique: bool - if True, index enforces unique keys
+    '''
+    from pymongo.errors import OperationFailure
+    _store = watermarks if watermarks is not None else WatermarkStore(db)
+    _date_col, _group_cols = _split_date_column(column)
+    _marks = {group: frame[_date_col].max() for group, frame in _frame_groups(df, _group_cols)}
+    _docs = df.to_dict(orient='records')
+    _keys = [field for field, _ in set_index]
+    # indexes cannot be created inside a transaction, so they are ensured beforehand
+    get_index_registry().ensure_index(db[collection_name], set_index, unique=unique)
+
+    def _write(session=None) -> dict:
+        _result = bulk_upsert(db, collection_name, _docs, _keys, session=session)
+        for group, mark in _marks.items():
+            _store.advance(collection_name, mark, group, session=session)
+        return _result
+
+    with db.client.start_session() as session:
+        try:
+            return session.with_transaction(_write)
+        except OperationFailure as e:
+            # IllegalOperation: transactions need a replica set or sharded cluster
+            if e.code != 20:
+                raise
+    return _write()
@@ -1,6 +1,8 @@
 import pandas as pd
 import spacy
 import multiextractor
+from multiextractor.cache import TextStatsCache
+from multiextractor.transforms.text import count_sentences, count_tokens, profile_texts, profile_texts_parallel, nlp_fingerprint, DEFAULT_BATCH_SIZE, PARALLEL_MIN_TEXTS, TEXT_STAT_NAMES
 
 
 def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -26,18 +28,57 @@ def process_datetime(df: pd.DataFrame, date_col='publishedAt') -> pd.DataFrame:
     _tmp['publishedTime'] = _tmp[date_col].dt.time
     return _tmp
 
-def process_sentence_count(df: pd.DataFrame, nlp: spacy.lang, *cols) -> pd.DataFrame:
-    '''Get number of sentences from string columns'''
+def process_sentence_count(df: pd.DataFrame, nlp: spacy.lang, *cols, batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    '''Get number of sentences from string columns, batching each column through the NLP pipeline'''
     
     _tmp = df.copy()
     for col in cols:
-        _tmp[f'{col}NumSents'] = _tmp[col].apply(lambda x: len(multiextractor.extract_sentences(x, nlp)))
+        _tmp[f'{col}NumSents'] = count_sentences(_tmp[col], nlp, batch_size=batch_size)
     return _tmp
 
-def process_token_count(df: pd.DataFrame, nlp: spacy.lang, *cols) -> pd.DataFrame:
-    '''Get number of word tokens from string columns'''
+def process_token_count(df: pd.DataFrame, nlp: spacy.lang, *cols, token_backend: str = 'nltk') -> pd.DataFrame:
+    '''Get number of word tokens from string columns, per row through NLTK or vectorized over each column with the `regex` backend'''
     
     _tmp = df.copy()
     for col in cols:
-        _tmp[f'{col}NumTokens'] = _tmp[col].apply(lambda x: len(multiextractor.extract_tokens(x, nlp)))
-    return _tmp
\ No newline at end of file
+        if token_backend == 'regex':
+            _tmp[f'{col}NumTokens'] = count_tokens(_tmp[col])['NumTokens']
+        else:
+            _tmp[f'{col}NumTokens'] = _tmp[col].apply(lambda x: len(multiextractor.extract_tokens(x)))
+    return _tmp
+
+def _compute_text_stats(texts: list[str], nlp: spacy.lang, batch_size: int, char_stats: bool, n_process: int, token_backend: str) -> dict[str, list]:
+    if (n_process > 1) and (len(texts) >= PARALLEL_MIN_TEXTS):
+        return profile_texts_parallel(texts, nlp, n_process=n_process, batch_size=batch_size, char_stats=char_stats, token_backend=token_backend)
+    return profile_texts(texts, nlp, batch_size=batch_size, char_stats=char_stats, token_backend=token_backend)
+
+def _cached_text_stats(texts: list[str], nlp: spacy.lang, cache: TextStatsCache, batch_size: int, n_process: int, token_backend: str) -> dict[str, list]:
+    '''Looks up statistics of all texts in memo cache and computes only those of unseen texts'''
+    _texts = [text if isinstance(text, str) else '' for text in texts]
+    _fingerprint = nlp_fingerprint(nlp, token_backend)
+    _keys = [cache.make_key(text, _fingerprint) for text in _texts]
+    _found = cache.get_many(_keys)
+    _missing = {key: text for key, text in zip(_keys, _texts) if key not in _found}
+    if len(_missing) > 0:
+        _stats = _compute_text_stats(list(_missing.values()), nlp, batch_size, True, n_process, token_backend)
+        _new = {key: {stat: _stats[stat][i] for stat in TEXT_STAT_NAMES} for i, key in enumerate(_missing)}
+        cache.set_many(_new)
+        _found.update(_new)
+    return {stat: [_found[key][stat] for key in _keys] for stat in TEXT_STAT_NAMES}
+
+def process_text_stats(df: pd.DataFrame, nlp: spacy.lang, *cols, batch_size: int = DEFAULT_BATCH_SIZE, char_stats: bool = False, n_process: int = 1, cache: TextStatsCache | None = None, token_backend: str = 'nltk') -> pd.DataFrame:
+    '''
+    Get number of sentences and word tokens (optionally character and word-length stats) from string columns in one pass, without intermediate copies.
+    With `n_process` above 1, large frames are profiled across worker processes; small frames always take the serial path.
+    With a text statistics cache, only texts not profiled before under the same NLP pipeline are processed.
+    With the `regex` token backend, tokens are counted vectorized over all texts instead of per row through NLTK.
+    '''
+    _stat_names = ['NumSents', 'NumTokens'] + (['NumChars', 'AvgWordLen'] if char_stats else [])
+    _texts = [text for col in cols for text in df[col]]
+    if cache is None:
+        _stats = _compute_text_stats(_texts, nlp, batch_size, char_stats, n_process, token_backend)
+    else:
+        _stats = _cached_text_stats(_texts, nlp, cache, batch_size, n_process, token_backend)
+    _n = df.shape[0]
+    _new_cols = {f'{col}{stat}': _stats[stat][i * _n:(i + 1) * _n] for stat in _stat_names for i, col in enumerate(cols)}
+    return df.assign(**_new_cols)
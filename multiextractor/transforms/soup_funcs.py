@@ -1,5 +1,74 @@
 from datetime import datetime
+import re
 import bs4
+from multiextractor.constants import TRANSLATOR
+
+DEFAULT_PARSER = 'lxml'
+PARSER_BACKENDS = ('lxml', 'html.parser', 'html5lib')
+
+_SELECTOR_REGEX = re.compile(r'^\s*(?P<name>[\w-]+)?(?:\[(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~]?=)\s*["\']?(?P<value>[^"\'\]]*)["\']?)?\])?\s*$')
+
+def build_strainer(element_search: str) -> bs4.SoupStrainer | None:
+    '''
+    Builds SoupStrainer from simple element search string so that only matching subtrees are parsed.  Supports tag names with at most one
+    attribute condition (e.g. `div[id="story_text"]`, `div[id*="heroes"]`); returns None for any other selector, in which case the full page is parsed.
+
+    :params:
+    element_search: str - search string used to identify specific elements for extraction
+    '''
+    _match = _SELECTOR_REGEX.match(element_search)
+    if (_match is None) or ((_match['name'] is None) and (_match['attr'] is None)):
+        return None
+    _attrs = {}
+    if _match['attr'] is not None:
+        _value = _match['value']
+        match _match['op']:
+            case None:
+                _attrs[_match['attr']] = True
+            case '=':
+                _attrs[_match['attr']] = _value
+            case '~=':
+                _attrs[_match['attr']] = re.compile(r'(^|\s)' + re.escape(_value) + r'(\s|$)')
+            case '*=':
+                _attrs[_match['attr']] = re.compile(re.escape(_value))
+            case '^=':
+                _attrs[_match['attr']] = re.compile('^' + re.escape(_value))
+            case '$=':
+                _attrs[_match['attr']] = re.compile(re.escape(_value) + '$')
+    return bs4.SoupStrainer(_match['name'], attrs=_attrs)
+
+def _class_token_pattern(value: str) -> re.Pattern:
+    '''Matches raw `class` attribute string containing every class token of value, in any order'''
+    return re.compile('^' + ''.join(r'(?=(?:.*\s)?' + re.escape(token) + r'(?:\s|$))' for token in value.split()))
+
+def build_attrs_strainer(name: str, attrs: dict[str, str] | None = None) -> bs4.SoupStrainer:
+    '''
+    Builds SoupStrainer from tag name and attributes, as given to `find`.  Parser backends hand raw attribute strings to the strainer, so a
+    `class` value is matched by its tokens, as `find` does, and elements carrying further classes (e.g. `class="article-body wide"`) are kept.
+
+    :params:
+    name: str - tag name of elements to be parsed
+    attrs: dict[str, str] - optional, attributes identifying elements to be parsed
+    '''
+    _attrs = dict(attrs or {})
+    if isinstance(_attrs.get('class', None), str):
+        _attrs['class'] = _class_token_pattern(_attrs['class'])
+    return bs4.SoupStrainer(name, attrs=_attrs)
+
+def build_soup(markup: bytes | str, parser: str = DEFAULT_PARSER, parse_only: bs4.SoupStrainer | None = None) -> bs4.BeautifulSoup:
+    '''
+    Parses HTML with selected BeautifulSoup backend, optionally building only the subtrees matched by a SoupStrainer.
+    
+    :params:
+    markup: bytes or str - raw HTML to be parsed
+    parser: str - BeautifulSoup parser backend.  Values given include `lxml`, `html.parser` and `html5lib`
+    parse_only: SoupStrainer object - optional, restricts parsing to matching elements; ignored by `html5lib` which always builds the full tree
+    '''
+    if parser not in PARSER_BACKENDS:
+        raise Exception(f'Parser backend must be one of {PARSER_BACKENDS}')
+    if parser == 'html5lib':
+        parse_only = None
+    return bs4.BeautifulSoup(markup, parser, parse_only=parse_only)
 
 def locate_elements(soup: bs4.BeautifulSoup, element_search: str, method: str, **kwargs):
     '''
@@ -42,6 +111,56 @@ def process_text(soup: bs4.BeautifulSoup, nature: str, method: str | None = None
         case _:
             raise Exception('Please select correct text processing')
         
+def parse_content(markup: bytes | str, element_search: str, method: str, parser: str = DEFAULT_PARSER, partial: bool = True):
+    '''
+    Parses fetched page and locates elements for extraction.
+
+    :params:
+    markup: bytes or str - raw HTML body of fetched page
+    element_search: str - search string to be used to identify specific elements for extraction as per method used
+    method: str - method of searching.  Values given include `select` and `find`.
+    parser: str - BeautifulSoup parser backend used for page
+    partial: bool - if True, only subtrees matching `element_search` are built when the selector is simple enough to be strained
+    '''
+    soup = build_soup(markup, parser, parse_only=build_strainer(element_search) if partial else None)
+    return locate_elements(soup, element_search, method)
+
+def parse_rss_body(markup: bytes | str, body_attrs: dict[str, str] | None = None, list_attrs: dict[str, str] | None = None, parser: str = DEFAULT_PARSER, partial: bool = True) -> str:
+    '''
+    Parses fetched RSS article page and joins text of article body.
+
+    :params:
+    markup: bytes or str - raw HTML body of fetched article page
+    body_attrs: dict[str, str] - optional, attributes identifying article body element
+    list_attrs: dict[str, str] - optional, attributes identifying text blocks within article body
+    parser: str - BeautifulSoup parser backend used for page
+    partial: bool - if True and body attributes are given, only the article body subtree is built
+    '''
+    _body_kwargs, _list_kwargs = {}, {}
+    _strainer = build_attrs_strainer('div', body_attrs) if partial & (body_attrs is not None) else None
+    soup = build_soup(markup, parser, parse_only=_strainer)
+    
+    if body_attrs is not None: _body_kwargs.update({'attrs': body_attrs})
+    _art_body = locate_elements(soup, 'div', 'find', **_body_kwargs)
+    if (_art_body is None) and (_strainer is not None):
+        # strained tree missed article body, e.g. attributes matched differently at parse time; full page is parsed instead
+        _art_body = locate_elements(build_soup(markup, parser), 'div', 'find', **_body_kwargs)
+    
+    if list_attrs is not None: _list_kwargs.update({'attrs': list_attrs})
+    _body_list = process_text(_art_body, 'summary', 'find', 'div', **_list_kwargs)
+    return ' '.join(_body_list)
+
+def parse_scidaily_story(markup: bytes | str, parser: str = DEFAULT_PARSER) -> str:
+    '''
+    Parses fetched Science Daily story page and returns story text.
+
+    :params:
+    markup: bytes or str - raw HTML body of fetched story page
+    parser: str - BeautifulSoup parser backend used for page
+    '''
+    soup_story = parse_content(markup, 'div[id="story_text"]', 'select', parser)[0]
+    return process_text(soup_story, 'story', translator=TRANSLATOR)
+
 def extract_date(href):
     '''
     Extract and convert text date extracted from web element into readable full date-time format.
@@ -1,8 +1,29 @@
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Iterable
 import re
+import atexit
+from collections import deque
 from nltk.tokenize import word_tokenize
+import polars as pl
 import spacy
 
+DEFAULT_BATCH_SIZE = 64
+ALPHANUM_PATTERN = r'\w+'
+ALPHANUM_REGEX = re.compile(ALPHANUM_PATTERN)
+TOKEN_BACKENDS = ('nltk', 'regex')
+SENTENCE_PIPES = ('transformer', 'tok2vec', 'parser', 'senter', 'sentencizer')
+SENTENCE_SETTERS = ('parser', 'senter', 'sentencizer')
+
+TEXT_STATS_VERSION = 1
+TEXT_STAT_NAMES = ['NumSents', 'NumTokens', 'NumChars', 'AvgWordLen']
+PARALLEL_MIN_TEXTS = 500
+TARGET_CHUNK_CHARS = 200000
+MAX_CHUNK_TEXTS = 1000
+NLP_WORKER_PRELOAD_MODULES = ['spacy', 'nltk', 'multiextractor.transforms.text']
+
+_RULE_BASED_SENTENCIZERS = {}
+_NLP_EXECUTORS = {}
+_WORKER_NLP = None
+
 def extract_tokens(text: List[str], remove_puncs: Optional[bool] = True) -> List[str]:
     '''
     Extracts tokens from string data using NLP tokenizer with option to remove punctuations.
@@ -14,10 +35,31 @@ def extract_tokens(text: List[str], remove_puncs: Optional[bool] = True) -> List
     _stripped_text = text.strip()
     _tokens = list(filter(lambda s: s != '', word_tokenize(_stripped_text)))
     if remove_puncs:
-        alphanum_regex = re.compile(r'\w+')
-        _tokens = alphanum_regex.findall(' '.join(_tokens))
+        _tokens = ALPHANUM_REGEX.findall(' '.join(_tokens))
     return _tokens
 
+def count_tokens(texts: Iterable[str], char_stats: bool = False) -> dict[str, List]:
+    '''
+    Vectorized token counting over a whole column with Polars string kernels, without building per-row token lists.  Tokens are runs of
+    word characters (`\\w+`), matched directly on the raw text.  Non-string values are counted as empty text.
+
+    Counts diverge from `extract_tokens` where NLTK splits inside a word before the regex is applied: contractions such as "don't"
+    count 2 here but 3 through NLTK ("do", "n", "t"), and "cannot" counts 1 here but 2 ("can", "not").  Word characters are the same in
+    both paths, so character totals used for average word length agree.
+
+    :params:
+    texts: Iterable[Str] - given texts
+    char_stats: bool - if True, additionally returns character count and average word length
+    '''
+    _series = pl.Series('text', [text if isinstance(text, str) else '' for text in texts], dtype=pl.Utf8)
+    _num_tokens = _series.str.count_matches(ALPHANUM_PATTERN)
+    _stats = {'NumTokens': _num_tokens.to_list()}
+    if char_stats:
+        _word_chars = _series.str.count_matches(r'\w')
+        _stats['NumChars'] = _series.str.len_chars().to_list()
+        _stats['AvgWordLen'] = (_word_chars / _num_tokens).fill_nan(0.0).fill_null(0.0).to_list()
+    return _stats
+
 def extract_sentences(sent: List[str], nlp: spacy.lang):
     '''
     Extracts sentences from string data using NLP sentencizer.
@@ -27,4 +69,142 @@ def extract_sentences(sent: List[str], nlp: spacy.lang):
     nlp: object - imported spacy english model
     '''
     _doc = nlp(sent)
-    return list(_doc.sents)
\ No newline at end of file
+    return list(_doc.sents)
+
+def _rule_based_sentencizer(lang: str) -> spacy.language.Language:
+    '''Returns cached blank pipeline of given language with rule-based sentencizer'''
+    if lang not in _RULE_BASED_SENTENCIZERS:
+        _nlp = spacy.blank(lang)
+        _nlp.add_pipe('sentencizer')
+        _RULE_BASED_SENTENCIZERS[lang] = _nlp
+    return _RULE_BASED_SENTENCIZERS[lang]
+
+def _sentence_pipeline(nlp: spacy.lang) -> tuple[spacy.language.Language, List[str]]:
+    '''Returns pipeline able to set sentence boundaries and names of its components not needed for them'''
+    _nlp = nlp if any(name in nlp.pipe_names for name in SENTENCE_SETTERS) else _rule_based_sentencizer(nlp.lang)
+    return _nlp, [name for name in _nlp.pipe_names if name not in SENTENCE_PIPES]
+
+def count_sentences(texts: Iterable[str], nlp: spacy.lang, batch_size: int = DEFAULT_BATCH_SIZE) -> List[int]:
+    '''
+    Counts sentences of many texts in batches through `nlp.pipe`, running only the components needed for sentence boundaries.
+    Falls back to rule-based sentencizer if pipeline has no component setting sentence boundaries.  Non-string values are counted as empty text.
+    
+    :params:
+    texts: Iterable[Str] - given texts
+    nlp: object - imported spacy english model
+    batch_size: int - number of texts processed per batch
+    '''
+    _texts = [text if isinstance(text, str) else '' for text in texts]
+    _nlp, _disable = _sentence_pipeline(nlp)
+    with _nlp.select_pipes(disable=_disable):
+        return [len(list(doc.sents)) for doc in _nlp.pipe(_texts, batch_size=batch_size)]
+
+def profile_texts(texts: Iterable[str], nlp: spacy.lang, batch_size: int = DEFAULT_BATCH_SIZE, char_stats: bool = False, token_backend: str = 'nltk') -> dict[str, List]:
+    '''
+    Computes text statistics of many texts in a single pass, pairing each text with its batched NLP document.  Sentence and token counts match
+    `extract_sentences` and `extract_tokens`, or `count_tokens` with the `regex` token backend.  Non-string values are profiled as empty text.
+    
+    :params:
+    texts: Iterable[Str] - given texts
+    nlp: object - imported spacy english model
+    batch_size: int - number of texts processed per batch
+    char_stats: bool - if True, additionally returns character count and average word length
+    token_backend: str - `nltk` to count tokens per text as `extract_tokens`, or `regex` to count them vectorized over all texts
+    '''
+    if token_backend not in TOKEN_BACKENDS:
+        raise ValueError(f'Unknown token backend {token_backend}, expected one of {TOKEN_BACKENDS}')
+    _texts = [text if isinstance(text, str) else '' for text in texts]
+    _stats = {'NumSents': [], 'NumTokens': []}
+    if char_stats: _stats.update({'NumChars': [], 'AvgWordLen': []})
+
+    _nlp, _disable = _sentence_pipeline(nlp)
+    with _nlp.select_pipes(disable=_disable):
+        for text, doc in zip(_texts, _nlp.pipe(_texts, batch_size=batch_size)):
+            _stats['NumSents'].append(len(list(doc.sents)))
+            if token_backend == 'nltk':
+                _tokens = extract_tokens(text)
+                _stats['NumTokens'].append(len(_tokens))
+                if char_stats:
+                    _stats['NumChars'].append(len(text))
+                    _stats['AvgWordLen'].append(sum(map(len, _tokens)) / len(_tokens) if len(_tokens) > 0 else 0.0)
+    if token_backend == 'regex':
+        _stats.update(count_tokens(_texts, char_stats=char_stats))
+    return _stats
+
+def _init_nlp_worker(nlp: spacy.lang):
+    '''Keeps NLP pipeline received once at worker start for all later tasks'''
+    global _WORKER_NLP
+    _WORKER_NLP = nlp
+
+def _profile_chunk(texts: List[str], batch_size: int, char_stats: bool, token_backend: str) -> dict[str, List]:
+    return profile_texts(texts, _WORKER_NLP, batch_size=batch_size, char_stats=char_stats, token_backend=token_backend)
+
+def _adaptive_chunks(texts: Iterable[str], target_chars: int = TARGET_CHUNK_CHARS, max_texts: int = MAX_CHUNK_TEXTS):
+    '''Groups texts into chunks of roughly equal total length, so that long articles form small chunks and short headlines large ones'''
+    _chunk, _chars = [], 0
+    for text in texts:
+        _chunk.append(text)
+        _chars += len(text) if isinstance(text, str) else 0
+        if (_chars >= target_chars) or (len(_chunk) >= max_texts):
+            yield _chunk
+            _chunk, _chars = [], 0
+    if len(_chunk) > 0:
+        yield _chunk
+
+def _nlp_executor(nlp: spacy.lang, n_process: int):
+    '''Returns worker pool holding given NLP pipeline, started once per pipeline and worker count'''
+    from multiextractor.workers import SharedExecutor
+    _key = (id(nlp), n_process)
+    if _key not in _NLP_EXECUTORS:
+        _NLP_EXECUTORS[_key] = SharedExecutor(n_process, preload=NLP_WORKER_PRELOAD_MODULES, initializer=_init_nlp_worker, initargs=(nlp,))
+    return _NLP_EXECUTORS[_key]
+
+def profile_texts_parallel(texts: Iterable[str], nlp: spacy.lang, n_process: int = 2, batch_size: int = DEFAULT_BATCH_SIZE, char_stats: bool = False, max_pending: int | None = None, token_backend: str = 'nltk') -> dict[str, List]:
+    '''
+    Multi-process variant of `profile_texts` for large batches.  The pipeline is sent once to each worker when it starts, texts are split
+    into chunks sized by text length, and at most `max_pending` chunks are in flight so memory stays bounded.  Results are returned in input order.
+    
+    :params:
+    texts: Iterable[Str] - given texts, consumed lazily
+    nlp: object - imported spacy english model
+    n_process: int - number of worker processes
+    batch_size: int - number of texts processed per `nlp.pipe` batch within each worker
+    char_stats: bool - if True, additionally returns character count and average word length
+    max_pending: int - optional, maximum number of chunks submitted but not yet collected; defaults to twice the worker count
+    token_backend: str - `nltk` or `regex`, as in `profile_texts`
+    '''
+    _executor = _nlp_executor(nlp, n_process)
+    _max_pending = max_pending if max_pending is not None else 2 * n_process
+    _stats = {'NumSents': [], 'NumTokens': []}
+    if char_stats: _stats.update({'NumChars': [], 'AvgWordLen': []})
+
+    def _collect(future):
+        for name, values in future.result().items():
+            _stats[name].extend(values)
+
+    _pending = deque()
+    for chunk in _adaptive_chunks(texts):
+        if len(_pending) >= _max_pending:
+            _collect(_pending.popleft())
+        _pending.append(_executor.submit(_profile_chunk, chunk, batch_size, char_stats, token_backend))
+    while len(_pending) > 0:
+        _collect(_pending.popleft())
+    return _stats
+
+@atexit.register
+def _shutdown_nlp_executors():
+    for _executor in _NLP_EXECUTORS.values():
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+def nlp_fingerprint(nlp: spacy.lang, token_backend: str = 'nltk') -> str:
+    '''Identifies NLP pipeline, token backend and statistics version, for use in text statistics cache keys'''
+    _nlp, _ = _sentence_pipeline(nlp)
+    _meta = _nlp.meta
+    return '|'.join([
+        f'v{TEXT_STATS_VERSION}',
+        token_backend,
+        spacy.__version__,
+        f'{_meta.get("lang", "")}_{_meta.get("name", "")}',
+        _meta.get('version', ''),
+        ','.join(name for name in _nlp.pipe_names if name in SENTENCE_PIPES)
+    ])
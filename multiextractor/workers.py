@@ -0,0 +1,133 @@
+import os
+import atexit
+import asyncio
+import threading
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+
+DEFAULT_MAX_WORKERS = os.cpu_count() or 4
+WORKER_PRELOAD_MODULES = ['bs4', 'lxml', 'multiextractor.transforms.soup_funcs', 'multiextractor.transforms.feeds']
+
+def _preload_modules(modules: list[str], initializer=None, initargs: tuple = ()):
+    '''Imports modules once per worker process so that tasks do not pay import cost, then runs optional worker initializer'''
+    for module in modules:
+        importlib.import_module(module)
+    if initializer is not None:
+        initializer(*initargs)
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    '''Selects `forkserver` start method where available so workers start from a small, clean interpreter'''
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+class SharedExecutor:
+    '''
+    Long-lived process pool shared across pipelines.  Workers are started lazily on first submission, preloaded with only the modules
+    the submitted tasks need, and reused for every later task until shutdown.  Tracks submitted, completed and failed tasks to report utilization.
+
+    :params:
+    max_workers: int - number of worker processes
+    preload: list of str - modules imported in each worker on start
+    initializer: callable - optional, run once in each worker on start, after preloading, e.g. to load a model
+    initargs: tuple - arguments of initializer
+    '''
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, preload: list[str] | None = None, initializer=None, initargs: tuple = ()):
+        self.max_workers = max_workers
+        self.preload = preload if preload is not None else WORKER_PRELOAD_MODULES
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _start(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                _ctx = _worker_context()
+                if _ctx.get_start_method() == 'forkserver':
+                    _ctx.set_forkserver_preload(self.preload)
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=_ctx,
+                    initializer=_preload_modules,
+                    initargs=(self.preload, self.initializer, self.initargs)
+                )
+            return self._executor
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._completed += 1
+            if future.cancelled() or (future.exception() is not None):
+                self._failed += 1
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        '''Submits task to worker pool, starting workers if not yet running'''
+        _executor = self._start()
+        with self._lock:
+            self._submitted += 1
+        future = _executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        '''Runs task in worker pool and awaits its result without blocking event loop'''
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def stats(self) -> dict:
+        '''Returns utilization of pool, including queue depth and number of busy workers'''
+        with self._lock:
+            _in_flight = self._submitted - self._completed
+            _busy = min(_in_flight, self.max_workers) if self.running else 0
+            return {
+                'max_workers': self.max_workers,
+                'running': self.running,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'busy_workers': _busy,
+                'queue_depth': _in_flight - _busy,
+                'utilization': _busy / self.max_workers
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        '''Stops worker processes; pool is restarted on next submission'''
+        with self._lock:
+            _executor, self._executor = self._executor, None
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+_SHARED_EXECUTOR = None
+_SHARED_LOCK = threading.Lock()
+
+def get_shared_executor(max_workers: int | None = None) -> SharedExecutor:
+    '''
+    Returns process-wide shared executor, creating it on first call.  Worker count is fixed by the first caller.
+
+    :params:
+    max_workers: int - optional, number of worker processes if executor has not been created yet
+    '''
+    global _SHARED_EXECUTOR
+    with _SHARED_LOCK:
+        if _SHARED_EXECUTOR is None:
+            _SHARED_EXECUTOR = SharedExecutor(max_workers if max_workers is not None else DEFAULT_MAX_WORKERS)
+        return _SHARED_EXECUTOR
+
+def shutdown_shared_executor(wait: bool = True):
+    '''Shuts down process-wide shared executor if started'''
+    with _SHARED_LOCK:
+        if _SHARED_EXECUTOR is not None:
+            _SHARED_EXECUTOR.shutdown(wait=wait)
+
+def executor_stats() -> dict | None:
+    '''Returns utilization of process-wide shared executor, or None if not created'''
+    return _SHARED_EXECUTOR.stats() if _SHARED_EXECUTOR is not None else None
+
+atexit.register(shutdown_shared_executor)
@@ -0,0 +1,76 @@
+import pytest
+import multiextractor.query as query
+
+class FakePipeline:
+    def __init__(self, results):
+        self.results = results
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append(('set', key))
+
+    def hset(self, key, mapping):
+        self.commands.append(('hset', key))
+
+    def expire(self, key, ttl):
+        self.commands.append(('expire', key))
+
+    def execute(self, raise_on_error=True):
+        return self.results.pop(0)
+
+class FakeRedis:
+    def __init__(self, results):
+        self.pipe = FakePipeline(results)
+
+    def pipeline(self, transaction=True):
+        return self.pipe
+
+def _insert(monkeypatch, records, results, **kwargs):
+    _rd = FakeRedis(results)
+    monkeypatch.setattr(query, 'redis_connection', lambda conn_params: _rd)
+    kwargs.setdefault('serializer', 'json')
+    return query.key_val_insert(records, **kwargs), _rd.pipe.commands
+
+def test_hash_failures_with_ttl_are_reported_per_record(monkeypatch):
+    records = {'a': {'title': 'x'}, 'b': {'title': 'y'}, 'c': {'title': 'z'}}
+    # a: HSET fails, EXPIRE succeeds; b: HSET succeeds, EXPIRE fails; c: both succeed
+    results = [[Exception('hset a'), 1, 1, Exception('expire b'), 1, 1]]
+    report, commands = _insert(monkeypatch, records, results, storage='hash', ttl=60)
+    assert len(commands) == 6
+    assert report['written'] == 1
+    assert report['failed'] == 2
+    assert report['failed_keys'] == ['a', 'b']
+
+def test_hash_failures_with_ttl_by_key(monkeypatch):
+    records = {'a': {'title': 'x'}, 'b': {'title': 'y'}, 'c': {'title': 'z'}}
+    # a has no TTL, so its single command is followed directly by b's pair
+    results = [[1, Exception('hset b'), 1, 1, Exception('expire c')]]
+    report, _ = _insert(monkeypatch, records, results, storage='hash', ttl={'b': 60, 'c': 60})
+    assert report['written'] == 1
+    assert report['failed_keys'] == ['b', 'c']
+
+def test_empty_hash_is_failed_without_misaligning_results(monkeypatch):
+    records = {'a': {}, 'b': {'title': 'y'}, 'c': {'title': 'z'}}
+    results = [[1, 1, Exception('hset c'), 1]]
+    report, commands = _insert(monkeypatch, records, results, storage='hash', ttl=60)
+    assert ('hset', 'a') not in commands
+    assert report['written'] == 1
+    assert report['failed_keys'] == ['a', 'c']
+
+def test_string_failures_across_chunks(monkeypatch):
+    records = {'a': {'title': 'x'}, 'b': {'title': 'y'}, 'c': {'title': 'z'}}
+    results = [[True, Exception('set b')], [True]]
+    report, _ = _insert(monkeypatch, records, results, chunk_size=2)
+    assert report['chunks'] == 2
+    assert report['written'] == 2
+    assert report['failed_keys'] == ['b']
+
+def test_unknown_serializer_raises(monkeypatch):
+    with pytest.raises(ValueError):
+        _insert(monkeypatch, {'a': {'title': 'x'}}, [[True]], serializer='pickle')
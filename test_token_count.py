@@ -0,0 +1,23 @@
+import pytest
+import multiextractor
+
+@pytest.mark.parametrize('text, nltk_count, regex_count', [
+    ("don't", 3, 2),
+    ('cannot', 2, 1),
+    ("We don't know", 5, 4),
+    ('Rates cannot fall', 4, 3),
+])
+def test_count_tokens_diverges_on_contractions(text, nltk_count, regex_count):
+    assert len(multiextractor.extract_tokens(text)) == nltk_count
+    assert multiextractor.count_tokens([text])['NumTokens'] == [regex_count]
+
+@pytest.mark.parametrize('text', [
+    'Central bank raises rates',
+    'Inflation eased to 3 percent in March',
+    'AI models and research growth',
+])
+def test_count_tokens_matches_extract_tokens(text):
+    assert multiextractor.count_tokens([text])['NumTokens'] == [len(multiextractor.extract_tokens(text))]
+
+def test_count_tokens_counts_non_strings_as_empty():
+    assert multiextractor.count_tokens(['market rates', None, 3.5])['NumTokens'] == [2, 0, 0]